@@ -0,0 +1,35 @@
+# Gunicorn settings shared by both Procfiles
+
+# Patch before anything else is imported: with preload_app the app (ssl, threading,
+# psycopg, the AI thread pool) loads in the master, ahead of the gevent worker's own
+# patching, and late patching leaves those modules blocking
+from gevent import monkey
+monkey.patch_all()
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# gevent workers keep many requests in flight while they wait on OpenAI / R2 / Postgres;
+# size the pool at 2*cores+1 unless the platform pins WEB_CONCURRENCY
+worker_class = "gevent"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_connections = int(os.environ.get("WORKER_CONNECTIONS", "1000"))
+
+# Reuse client connections behind the platform proxy instead of reconnecting per request
+keepalive = 5
+timeout = 60
+
+# Import the app (engine, blueprints, products table bootstrap) once in the master;
+# workers fork from the warm process instead of each repeating the startup work
+preload_app = True
+
+
+def post_fork(server, worker):
+    # Pooled connections opened in the master must not be shared across processes;
+    # drop them without closing so the child opens its own on first use
+    from src.main import app, db
+
+    with app.app_context():
+        db.engine.dispose(close=False)
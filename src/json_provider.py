@@ -0,0 +1,31 @@
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson.
+
+    Keeps Flask's fallback ``default`` for types orjson can't encode natively
+    (Decimal, dataclasses, ``__html__``); datetimes are emitted as ISO 8601.
+    """
+
+    def _option(self, indent: bool = False) -> int:
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        option = self._option(indent=bool(kwargs.get("indent")))
+        return orjson.dumps(obj, default=kwargs.get("default", self.default), option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        # Hand the encoded bytes straight to the response; no str round-trip
+        body = orjson.dumps(obj, default=self.default, option=self._option(indent=indent))
+        return self._app.response_class(body, mimetype=self.mimetype)
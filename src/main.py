@@ -1,45 +1,139 @@
 import os
-from flask import Flask, jsonify
-from flask_sqlalchemy import SQLAlchemy
+from flask import Flask, current_app, request
 from flask_cors import CORS
+from flask_compress import Compress
+from whitenoise import WhiteNoise
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from src.json_provider import ORJSONProvider
+from src.sqlite_pragmas import sqlite_pragmas
+from src.models.user import db
 
-# Initialize Flask 
-app = Flask(__name__)
-CORS(app)
+# The models' SQLAlchemy instance is the only one; it is bound to the app in create_app()
+compress = Compress()
+
+# -------------------------------
+# CORS (cache preflights for 24h)
+# -------------------------------
+CORS_ORIGINS = [o.strip() for o in os.environ.get("CORS_ORIGINS", "").split(",") if o.strip()] or "*"
+CORS_MAX_AGE = 86400
+
+# Preflights are best answered at the edge so they never reach gunicorn, e.g. nginx:
+#   if ($request_method = OPTIONS) { add_header Access-Control-Max-Age 86400; ...; return 204; }
+# or a Cloudflare rule matching OPTIONS /api/*. The handlers below are the in-app
+# fallback and emit cacheable 204s so a CDN in front can store them.
+def short_circuit_preflight():
+    # Skip view dispatch entirely; Flask-CORS still adds the Allow-* headers afterwards
+    if request.method == "OPTIONS" and request.path.startswith("/api/"):
+        return current_app.response_class(status=204)
+
+def cache_preflight(response):
+    # Let the CDN / browser reuse preflight answers instead of hitting a worker
+    if request.method == "OPTIONS":
+        response.headers["Cache-Control"] = f"public, max-age={CORS_MAX_AGE}"
+        response.vary.add("Origin")
+        response.vary.add("Access-Control-Request-Headers")
+    return response
 
 # -------------------------------
 # Database config (Postgres + SQLite fallback)
 # -------------------------------
-if os.environ.get("DATABASE_URL"):
-    db_url = os.environ["DATABASE_URL"]
+# Per worker process; keep workers * (pool + overflow) under the server's max_connections
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "20"))
 
-    # Ensure SQLAlchemy uses psycopg v3 instead of psycopg2
-    db_url = db_url.replace("postgres://", "postgresql+psycopg://")
-    db_url = db_url.replace("postgresql://", "postgresql+psycopg://")
+def _database_config():
+    if os.environ.get("DATABASE_URL"):
+        db_url = os.environ["DATABASE_URL"]
+
+        # Ensure SQLAlchemy uses psycopg v3 instead of psycopg2
+        db_url = db_url.replace("postgres://", "postgresql+psycopg://")
+        db_url = db_url.replace("postgresql://", "postgresql+psycopg://")
+
+        return db_url, {
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_recycle": 1800,
+            "pool_pre_ping": True,
+            "query_cache_size": 1200,
+            # Rows per multi-row INSERT when a list of params is executed (bulk imports)
+            "insertmanyvalues_page_size": 1000,
+            # psycopg 3 server-side prepares every statement on first use
+            "connect_args": {"prepare_threshold": 0},
+        }
 
-    app.config["SQLALCHEMY_DATABASE_URI"] = db_url
-else:
     # Local fallback
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///metier_cx.db"
+    return "sqlite:///metier_cx.db", {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "query_cache_size": 1200,
+        "insertmanyvalues_page_size": 1000,
+        "connect_args": {"check_same_thread": False},
+    }
 
-app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-db = SQLAlchemy(app)
+# SQLite tuning pragmas on every new connection; other drivers are skipped
+event.listen(Engine, "connect", sqlite_pragmas)
 
 # -------------------------------
-# Blueprints
+# Health check
 # -------------------------------
-from src.routes.admin import admin_bp
-app.register_blueprint(admin_bp)
+# Body is encoded once; a fresh Response per hit since after_request hooks mutate headers
+_HEALTH_BODY = b'{"ok":true}'
+
+def health():
+    return current_app.response_class(
+        _HEALTH_BODY,
+        mimetype="application/json",
+        headers={"Cache-Control": "no-store"},
+    )
 
 # -------------------------------
-# Health check
+# App factory
 # -------------------------------
-@app.route("/health")
-def health():
-    return jsonify(ok=True)
+def create_app():
+    app = Flask(__name__)
+    app.json = ORJSONProvider(app)
+
+    CORS(
+        app,
+        resources={
+            r"/api/*": {"origins": CORS_ORIGINS, "max_age": CORS_MAX_AGE},
+            r"/health": {"origins": CORS_ORIGINS, "max_age": CORS_MAX_AGE},
+        },
+        supports_credentials=False,
+    )
+    app.before_request(short_circuit_preflight)
+    app.after_request(cache_preflight)
+
+    # Product lists are highly compressible JSON; br/gzip per Accept-Encoding
+    app.config["COMPRESS_MIMETYPES"] = ["application/json"]
+    app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+    app.config["COMPRESS_LEVEL"] = 4
+    app.config["COMPRESS_BR_LEVEL"] = 4
+    app.config["COMPRESS_MIN_SIZE"] = 500
+    compress.init_app(app)
+
+    db_uri, engine_options = _database_config()
+    app.config["SQLALCHEMY_DATABASE_URI"] = db_uri
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    db.init_app(app)
+
+    # Blueprints
+    from src.routes.admin import admin_bp
+    app.register_blueprint(admin_bp)
+
+    app.add_url_rule("/health", view_func=health)
+
+    # Static files are indexed once at startup and served (with ETag / sendfile via
+    # wsgi.file_wrapper) before the request ever reaches Flask's routing.
+    app.wsgi_app = WhiteNoise(app.wsgi_app, root=app.static_folder, prefix="static/", max_age=3600)
+    return app
+
+app = create_app()
 
 # -------------------------------
-# Run
+# Run (local development only; production uses gunicorn + gevent, see Procfile)
 # -------------------------------
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=int(os.environ.get("PORT", 5000)))
@@ -1,4 +1,8 @@
 from datetime import datetime
+from operator import attrgetter
+import orjson
+from sqlalchemy import event, orm, update
+from sqlalchemy.orm.attributes import set_committed_value
 from src.models.user import db
 from src.models.product import Product
 
@@ -6,24 +10,38 @@ class Cart(db.Model):
     __tablename__ = 'carts'
     
     id = db.Column(db.Integer, primary_key=True)
-    session_id = db.Column(db.String(255), nullable=False, index=True)
+    session_id = db.Column(db.String(255), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    # Relationships
-    items = db.relationship('CartItem', backref='cart', lazy=True, cascade='all, delete-orphan')
+    # Relationships (items + their products load in one extra query, not 1+N)
+    items = db.relationship('CartItem', backref='cart', lazy='selectin', cascade='all, delete-orphan')
+    
+    # Composite indexes for cart lookup by visitor (session_id leads, so it also serves
+    # session-only lookups) and stale-cart cleanup
+    __table_args__ = (
+        db.Index('idx_cart_session_user', 'session_id', 'user_id'),
+        db.Index('idx_cart_updated', 'updated_at'),
+    )
     
     def to_dict(self):
+        # Single pass over items for the list and both totals
+        items, total_items, total_amount = [], 0, 0
+        for item in self.items:
+            items.append(item.to_dict())
+            total_items += item.quantity
+            total_amount += item.quantity * item.price
+        
         return {
             'id': self.id,
             'session_id': self.session_id,
             'user_id': self.user_id,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'items': [item.to_dict() for item in self.items],
-            'total_items': sum(item.quantity for item in self.items),
-            'total_amount': sum(item.quantity * item.price for item in self.items)
+            'items': items,
+            'total_items': total_items,
+            'total_amount': total_amount
         }
 
 class CartItem(db.Model):
@@ -38,16 +56,23 @@ class CartItem(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    product = db.relationship('Product', backref='cart_items', lazy=True)
+    product = db.relationship('Product', backref='cart_items', lazy='joined')
+    
+    # One line per product in a cart; cart_id leads, so this also serves loading a cart's items
+    __table_args__ = (
+        db.UniqueConstraint('cart_id', 'product_id', name='uq_cart_item_product'),
+    )
     
     def to_dict(self):
+        # One Decimal -> float conversion per row; round() keeps cent-exact subtotals
+        price, quantity = float(self.price), self.quantity
         return {
             'id': self.id,
             'cart_id': self.cart_id,
             'product_id': self.product_id,
-            'quantity': self.quantity,
-            'price': float(self.price),
-            'subtotal': float(self.price * self.quantity),
+            'quantity': quantity,
+            'price': price,
+            'subtotal': round(price * quantity, 2),
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'product': {
@@ -111,50 +136,117 @@ class Order(db.Model):
     shipped_at = db.Column(db.DateTime, nullable=True)
     delivered_at = db.Column(db.DateTime, nullable=True)
     
-    # Relationships
-    items = db.relationship('OrderItem', backref='order', lazy=True, cascade='all, delete-orphan')
+    # Pre-rendered to_dict() JSON of a frozen order, see store_rendered_json()
+    rendered_json = db.Column(db.Text, nullable=True)
     
-    def to_dict(self):
+    # Relationships (items + their products load in one extra query, not 1+N)
+    items = db.relationship('OrderItem', backref='order', lazy='selectin', cascade='all, delete-orphan')
+    
+    # Composite indexes for order history and status listings (newest first); the
+    # status index carries the listing's full sort key so no sort step is needed
+    __table_args__ = (
+        db.Index('idx_order_user_created', 'user_id', 'created_at'),
+        db.Index('idx_order_status_created_id', 'status',
+                 db.text('created_at DESC'), db.text('id DESC')),
+        db.Index('idx_order_session', 'session_id'),
+    )
+    
+    def to_summary_dict(self):
+        """Slim form for dashboard lists; reads six columns and no relationships"""
         return {
             'id': self.id,
             'order_number': self.order_number,
-            'user_id': self.user_id,
-            'session_id': self.session_id,
-            'status': self.status,
-            'customer_email': self.customer_email,
             'customer_name': self.customer_name,
-            'customer_phone': self.customer_phone,
-            'billing_address': {
-                'line1': self.billing_address_line1,
-                'line2': self.billing_address_line2,
-                'city': self.billing_city,
-                'state': self.billing_state,
-                'zip': self.billing_zip,
-                'country': self.billing_country
-            },
-            'shipping_address': {
-                'line1': self.shipping_address_line1,
-                'line2': self.shipping_address_line2,
-                'city': self.shipping_city,
-                'state': self.shipping_state,
-                'zip': self.shipping_zip,
-                'country': self.shipping_country
-            },
-            'subtotal': float(self.subtotal),
-            'tax_amount': float(self.tax_amount),
-            'shipping_amount': float(self.shipping_amount),
-            'discount_amount': float(self.discount_amount),
             'total_amount': float(self.total_amount),
-            'payment_method': self.payment_method,
-            'payment_status': self.payment_status,
-            'payment_reference': self.payment_reference,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'shipped_at': self.shipped_at.isoformat() if self.shipped_at else None,
-            'delivered_at': self.delivered_at.isoformat() if self.delivered_at else None,
-            'items': [item.to_dict() for item in self.items],
-            'total_items': sum(item.quantity for item in self.items)
+            'status': self.status,
+            'created_at': self.created_at.isoformat() if self.created_at else None
         }
+    
+    def to_json(self):
+        """Serializable form of the order; frozen orders reuse their stored JSON"""
+        if self.rendered_json:
+            return orjson.Fragment(self.rendered_json)
+        return self.to_dict()
+    
+    def to_dict(self):
+        # Single pass over items for the list and the count
+        items, total_items = [], 0
+        for item in self.items:
+            items.append(item.to_dict())
+            total_items += item.quantity
+        
+        (id_, order_number, user_id, session_id, status,
+         customer_email, customer_name, customer_phone,
+         payment_method, payment_status, payment_reference) = _order_scalars(self)
+        subtotal, tax_amount, shipping_amount, discount_amount, total_amount = _order_amounts(self)
+        created_at, updated_at, shipped_at, delivered_at = _order_timestamps(self)
+        
+        return {
+            'id': id_,
+            'order_number': order_number,
+            'user_id': user_id,
+            'session_id': session_id,
+            'status': status,
+            'customer_email': customer_email,
+            'customer_name': customer_name,
+            'customer_phone': customer_phone,
+            'billing_address': dict(zip(_ADDRESS_KEYS, _billing_address(self))),
+            'shipping_address': dict(zip(_ADDRESS_KEYS, _shipping_address(self))),
+            'subtotal': float(subtotal),
+            'tax_amount': float(tax_amount),
+            'shipping_amount': float(shipping_amount),
+            'discount_amount': float(discount_amount),
+            'total_amount': float(total_amount),
+            'payment_method': payment_method,
+            'payment_status': payment_status,
+            'payment_reference': payment_reference,
+            'created_at': created_at.isoformat() if created_at else None,
+            'updated_at': updated_at.isoformat() if updated_at else None,
+            'shipped_at': shipped_at.isoformat() if shipped_at else None,
+            'delivered_at': delivered_at.isoformat() if delivered_at else None,
+            'items': items,
+            'total_items': total_items
+        }
+
+# Column getters for Order.to_dict: one C-level call per group instead of a
+# descriptor lookup per attribute
+_order_scalars = attrgetter(
+    'id', 'order_number', 'user_id', 'session_id', 'status',
+    'customer_email', 'customer_name', 'customer_phone',
+    'payment_method', 'payment_status', 'payment_reference',
+)
+_order_amounts = attrgetter('subtotal', 'tax_amount', 'shipping_amount', 'discount_amount', 'total_amount')
+_order_timestamps = attrgetter('created_at', 'updated_at', 'shipped_at', 'delivered_at')
+_ADDRESS_KEYS = ('line1', 'line2', 'city', 'state', 'zip', 'country')
+_billing_address = attrgetter(
+    'billing_address_line1', 'billing_address_line2', 'billing_city',
+    'billing_state', 'billing_zip', 'billing_country',
+)
+_shipping_address = attrgetter(
+    'shipping_address_line1', 'shipping_address_line2', 'shipping_city',
+    'shipping_state', 'shipping_zip', 'shipping_country',
+)
+
+# Shipped / delivered orders no longer change, so their JSON is stored once the write
+# that moves them there has committed; any later ORM update of the order drops it again
+FROZEN_ORDER_STATUSES = frozenset(('shipped', 'delivered'))
+
+def store_rendered_json(order, order_dict):
+    """Save ``order_dict`` as the order's stored JSON (the caller commits)"""
+    # Keys sorted, as jsonify emits every other order
+    rendered = orjson.dumps(order_dict, option=orjson.OPT_SORT_KEYS).decode()
+    # Core UPDATE: no flush hooks, and updated_at keeps the value the rendered copy carries
+    orders = Order.__table__
+    db.session.execute(
+        update(orders).where(orders.c.id == order.id)
+        .values(rendered_json=rendered, updated_at=orders.c.updated_at)
+    )
+    set_committed_value(order, 'rendered_json', rendered)
+
+@event.listens_for(Order, 'before_update')
+def _drop_rendered_json(mapper, connection, target):
+    # Whatever changed may be part of the rendered copy
+    target.rendered_json = None
 
 class OrderItem(db.Model):
     __tablename__ = 'order_items'
@@ -175,9 +267,31 @@ class OrderItem(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
-    product = db.relationship('Product', backref='order_items', lazy=True)
+    product = db.relationship('Product', backref='order_items', lazy='joined')
+    
+    # Indexes for loading an order's items and a product's sales
+    __table_args__ = (
+        db.Index('idx_order_item_order', 'order_id'),
+        db.Index('idx_order_item_product', 'product_id'),
+    )
+    
+    # Order items are snapshots and never change once placed, so serialize each once;
+    # callers get a copy they can extend, as with Product.to_dict
+    _dict_cache = None
+    
+    @orm.reconstructor
+    def _reset_dict_cache(self):
+        self._dict_cache = None
     
     def to_dict(self):
+        if self._dict_cache is None:
+            self._dict_cache = self._build_dict()
+        data = dict(self._dict_cache)
+        if data['product'] is not None:
+            data['product'] = dict(data['product'])
+        return data
+    
+    def _build_dict(self):
         return {
             'id': self.id,
             'order_id': self.order_id,
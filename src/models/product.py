@@ -1,5 +1,6 @@
 from src.models.user import db
 from datetime import datetime
+from sqlalchemy import DDL, event, orm
 import json
 
 class Product(db.Model):
@@ -24,7 +25,39 @@ class Product(db.Model):
     fitment = db.relationship('Fitment', backref='product', cascade='all, delete-orphan')
     aliases = db.relationship('Alias', backref='product', cascade='all, delete-orphan')
     
+    # Storefront listing filter (active, optional category) in its id order; trigram
+    # GIN indexes so the ILIKE '%term%' search is an index probe on Postgres instead
+    # of a sequential scan (skipped on SQLite)
+    __table_args__ = (
+        db.Index('idx_product_status_category_id', 'status', 'category_id', 'id'),
+        db.Index('idx_product_title_trgm', 'title', postgresql_using='gin',
+                 postgresql_ops={'title': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+        db.Index('idx_product_sku_trgm', 'sku', postgresql_using='gin',
+                 postgresql_ops={'sku': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+        db.Index('idx_product_brand_trgm', 'brand', postgresql_using='gin',
+                 postgresql_ops={'brand': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+        db.Index('idx_product_model_trgm', 'model', postgresql_using='gin',
+                 postgresql_ops={'model': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+    )
+    
+    # SKUs are stored upper-case so search can match them with a case-sensitive LIKE
+    @orm.validates('sku')
+    def _normalize_sku(self, key, value):
+        return value.strip().upper() if value else value
+    
+    # Serialized form, reused until updated_at moves; callers get a copy they can extend
+    _dict_cache = None
+    
+    @orm.reconstructor
+    def _reset_dict_cache(self):
+        self._dict_cache = None
+    
     def to_dict(self):
+        if self._dict_cache is None or self._dict_cache[0] != self.updated_at:
+            self._dict_cache = (self.updated_at, self._build_dict())
+        return dict(self._dict_cache[1])
+    
+    def _build_dict(self):
         return {
             'id': self.id,
             'sku': self.sku,
@@ -39,6 +72,12 @@ class Product(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+# gin_trgm_ops comes from pg_trgm, which has to exist before the indexes are created
+event.listen(
+    Product.__table__, 'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql'),
+)
+
 class ProductDetail(db.Model):
     __tablename__ = 'product_details'
     
@@ -120,6 +159,13 @@ class Alias(db.Model):
     alias_type = db.Column(db.String(20), nullable=False)  # OEM, ALT, SUPERSEDED
     value = db.Column(db.String(100), nullable=False)
     
-    # Composite index for faster lookups
-    __table_args__ = (db.Index('idx_alias_type_value', 'alias_type', 'value'),)
+    # Composite index for faster lookups; per-product index for the search's EXISTS
+    # probe; trigram index for its ILIKE '%term%' (Postgres only, pg_trgm is
+    # enabled with products)
+    __table_args__ = (
+        db.Index('idx_alias_type_value', 'alias_type', 'value'),
+        db.Index('idx_alias_product', 'product_id'),
+        db.Index('idx_alias_value_trgm', 'value', postgresql_using='gin',
+                 postgresql_ops={'value': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+    )
 
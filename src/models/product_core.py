@@ -0,0 +1,95 @@
+"""Core (non-ORM) schema for the admin catalog's ``products`` table.
+
+The admin routes read and write this table through prebuilt Core statements, so
+SQLAlchemy compiles each one once per process and reuses it from its cache.
+Request bodies are decoded straight into ``ProductIn`` by msgspec.
+"""
+from typing import List, Optional, Union
+
+import msgspec
+from sqlalchemy import Column, Index, Integer, MetaData, REAL, Table, Text, TypeDecorator, text
+from sqlalchemy.dialects.postgresql import ARRAY
+
+class _CSVList(TypeDecorator):
+    """List of strings stored as comma-joined TEXT (SQLite fallback for TEXT[])."""
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return ",".join(value) if value is not None else None
+
+    def process_result_value(self, value, dialect):
+        return value.split(",") if value else []
+
+# Native text[] on Postgres: psycopg hands back a Python list, no per-row split/join
+IMAGE_LIST = ARRAY(Text).with_variant(_CSVList(), "sqlite")
+
+# Declared with Core so the DDL is rendered per dialect (SERIAL on Postgres,
+# INTEGER PRIMARY KEY rowid alias on SQLite)
+metadata = MetaData()
+products_table = Table(
+    "products", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", Text),
+    Column("sku", Text),
+    Column("category", Text),
+    Column("price", REAL, server_default=text("0")),
+    Column("discount_price", REAL, nullable=True),
+    Column("inventory", Integer, server_default=text("0")),
+    Column("image_url", Text),
+    Column("description", Text),
+    Column("product_images", IMAGE_LIST),
+    Column("specs", Text),
+)
+
+# Newest-first listing filtered by category
+Index("products_category_id_desc", products_table.c.category, products_table.c.id.desc())
+# One product per SKU; blank SKUs (the default) are left out
+Index(
+    "products_sku_unique", products_table.c.sku, unique=True,
+    postgresql_where=products_table.c.sku != "", sqlite_where=products_table.c.sku != "",
+)
+# Covering index so the paged listing is an index-only scan on Postgres
+Index(
+    "products_id_desc_inc", products_table.c.id.desc(),
+    postgresql_include=["name", "sku", "category", "price", "discount_price", "image_url", "inventory"],
+)
+
+INSERT_PRODUCT = products_table.insert().returning(products_table.c.id)
+# A list of params goes through insertmanyvalues batching (multi-row
+# INSERT ... RETURNING per page) instead of one statement per row
+BULK_INSERT_PRODUCTS = products_table.insert().returning(products_table.c.id, sort_by_parameter_order=True)
+
+class ProductIn(msgspec.Struct, rename={"discount_price": "discountPrice"}):
+    """Admin product payload, normalized to insert-ready values on decode.
+
+    Lenient like the admin form: nulls and blanks fall back to defaults, and
+    numbers may arrive as strings.
+    """
+    name: Optional[str] = None
+    sku: Optional[str] = None
+    category: Optional[str] = None
+    price: Union[float, str, None] = None
+    discount_price: Union[float, str, None] = None
+    inventory: Union[int, str, None] = None
+    image_url: Optional[str] = None
+    description: Optional[str] = None
+    product_images: Optional[List[str]] = None
+    specs: Optional[str] = None
+
+    def __post_init__(self):
+        # ValueErrors here surface as msgspec.ValidationError from the decoder
+        self.name = (self.name or "").strip()
+        # Upper-case, as the storefront model stores SKUs (its search matches them case-sensitively)
+        self.sku = (self.sku or "").strip().upper()
+        self.category = (self.category or "").strip()
+        self.price = float(self.price or 0)
+        self.discount_price = float(self.discount_price) if self.discount_price else None
+        self.inventory = int(self.inventory or 0)
+        self.image_url = (self.image_url or "").strip()
+        self.description = (self.description or "").strip()
+        self.product_images = self.product_images or []
+        self.specs = (self.specs or "").strip()
+
+class BulkProductsIn(msgspec.Struct):
+    products: List[ProductIn]
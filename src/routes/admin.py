@@ -1,23 +1,163 @@
 from __future__ import annotations
 import os
-from typing import Dict, Any
-from flask import Blueprint, jsonify, request
-from sqlalchemy import text
-from sqlalchemy.exc import SQLAlchemyError
-import boto3
-from botocore.config import Config
-from datetime import datetime
+import functools
+import itertools
+import hashlib
+import importlib.util
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from sqlalchemy import bindparam, inspect, select, text
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from urllib.parse import urlparse
+from werkzeug.utils import secure_filename
 import traceback
-from src.main import db
-from openai import OpenAI
+from src.models.user import db
+from src.models.product_core import BULK_INSERT_PRODUCTS, INSERT_PRODUCT, BulkProductsIn, ProductIn, products_table
+from src.services import catalog_cache, desc_cache, openai_batch, redis_client
+from src.services.r2_signer import R2Signer
 import json
+import orjson
+import msgspec
 
 # ------------------------------------------------------------------------------
 # Setup
 # ------------------------------------------------------------------------------
 admin_bp = Blueprint("admin", __name__, url_prefix="/api/admin")
-client = OpenAI()
+
+# ------------------------------------------------------------------------------
+# OpenAI helpers
+# ------------------------------------------------------------------------------
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+OPENAI_TEMPERATURE = float(os.getenv("OPENAI_TEMPERATURE", "0.4"))
+OPENAI_MAX_TOKENS = int(os.getenv("OPENAI_MAX_TOKENS", "800"))
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "20"))
+
+# Decided once at import so requests without AI support fail fast instead of raising
+AI_ENABLED = bool(os.getenv("OPENAI_API_KEY")) and importlib.util.find_spec("openai") is not None
+
+@functools.lru_cache(maxsize=1)
+def _openai_client():
+    # Imported lazily so workers that never call the AI routes skip the openai/httpx import chain;
+    # the single client keeps its connection pool alive across requests.
+    from openai import OpenAI
+    return OpenAI(api_key=os.environ["OPENAI_API_KEY"], timeout=OPENAI_TIMEOUT)
+
+DESCRIBE_SYSTEM_PROMPT = (
+    "You are a product data extractor and copywriter for an automotive parts catalog.\n"
+    "Analyze a product description/spec image and return ONLY valid JSON in this schema:\n\n"
+    "{\n"
+    '  "name": string,\n'
+    '  "category": string,\n'
+    '  "sku": string,\n'
+    '  "specs": string (markdown bullet list, bold labels),\n'
+    '  "description": string (markdown, 2+ paragraphs, professional tone, identifiers bold)\n'
+    "}"
+)
+
+# Background pool for batch describe calls; its size caps concurrent OpenAI calls per
+# worker (the client already retries 429s with backoff)
+OPENAI_CONCURRENCY = int(os.getenv("OPENAI_CONCURRENCY", "4"))
+_ai_executor = ThreadPoolExecutor(max_workers=OPENAI_CONCURRENCY, thread_name_prefix="ai-describe")
+
+# Async describe jobs need Redis + rq: the shared queue lets any web worker answer the
+# poll, and `rq worker ai-describe` processes scale separately from gunicorn. Without
+# it, {"async": true} is answered synchronously (a per-process job table would 404 on
+# polls that land on another worker)
+AI_QUEUE_ENABLED = bool(redis_client.REDIS_URL) and importlib.util.find_spec("rq") is not None
+AI_JOB_TIMEOUT = 60
+AI_RESULT_TTL = 3600
+
+@functools.lru_cache(maxsize=1)
+def _ai_queue():
+    from redis import Redis
+    from rq import Queue
+    return Queue("ai-describe", connection=Redis.from_url(redis_client.REDIS_URL))
+
+def _queued_job_status(job_id: str):
+    from rq.exceptions import NoSuchJobError
+    from rq.job import Job
+    try:
+        job = Job.fetch(job_id, connection=_ai_queue().connection)
+    except NoSuchJobError:
+        return jsonify(error="NotFound", message="Unknown job_id"), 404
+
+    status = job.get_status()
+    if status == "finished":
+        result = _describe_response(job.result, job.meta.get("price", ""), job.meta.get("inventory", ""))
+        result.update(job_id=job_id, status="done")
+        return jsonify(result)
+    if status in ("failed", "stopped", "canceled"):
+        return jsonify(job_id=job_id, status="failed", error="ServerError", message=f"Job {status}"), 500
+    return jsonify({"job_id": job_id, "status": "pending"}), 202
+
+def _describe_request_body(image_url: str) -> Dict[str, Any]:
+    # Shared by the realtime call and the Batch API so both send the same request
+    return {
+        "model": OPENAI_MODEL,
+        "response_format": {"type": "json_object"},
+        "messages": [
+            {"role": "system", "content": DESCRIBE_SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": "Extract fields and generate specs + description for this product image."},
+                    {"type": "image_url", "image_url": {"url": image_url}},
+                ],
+            },
+        ],
+        "max_tokens": OPENAI_MAX_TOKENS,
+        "temperature": OPENAI_TEMPERATURE,
+    }
+
+# Changes to the prompt or model produce new cache keys instead of stale hits
+_DESCRIBE_PROMPT_HASH = hashlib.blake2b(DESCRIBE_SYSTEM_PROMPT.encode("utf-8"), digest_size=8).hexdigest()
+
+@functools.lru_cache(maxsize=256)
+def _describe_image(image_url: str) -> Dict[str, Any]:
+    """Run the vision extraction once per image; repeat submissions are served from cache."""
+    # Shared cache first so a retry on another worker doesn't pay for OpenAI again
+    cache_key = desc_cache.make_key(img=image_url.strip(), model=OPENAI_MODEL, prompt=_DESCRIBE_PROMPT_HASH)
+    cached = desc_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    resp = _openai_client().chat.completions.create(**_describe_request_body(image_url))
+
+    raw = resp.choices[0].message.content or "{}"
+    parsed = json.loads(raw) if isinstance(raw, str) else raw
+    desc_cache.put(cache_key, parsed)
+    return parsed
+
+def _describe_response(parsed: Dict[str, Any], price: Any, inventory: Any) -> Dict[str, Any]:
+    return {
+        "name": parsed.get("name"),
+        "category": parsed.get("category"),
+        "sku": parsed.get("sku"),
+        "specs": parsed.get("specs"),
+        "description": parsed.get("description"),
+        "price": price,
+        "inventory": inventory
+    }
+
+MAX_DESCRIBE_BATCH = 50
+
+def _describe_many(items) -> list:
+    """Describe several images concurrently on the AI pool; results keep input order."""
+    futures = [_ai_executor.submit(_describe_image, item["image_url"]) for item in items]
+    results = []
+    for item, future in zip(items, futures):
+        try:
+            parsed = future.result()
+        except Exception as e:
+            traceback.print_exc()
+            results.append({"image_url": item["image_url"], "error": "ServerError", "message": str(e)})
+            continue
+        results.append(_describe_response(parsed, item.get("price", ""), item.get("inventory", "")))
+    return results
 
 # ------------------------------------------------------------------------------
 # R2 helpers
@@ -28,13 +168,64 @@ R2_PUBLIC_BASE = os.getenv("R2_PUBLIC_BASE", "").rstrip("/")
 R2_ACCESS_KEY_ID = os.getenv("R2_ACCESS_KEY_ID")
 R2_SECRET_ACCESS_KEY = os.getenv("R2_SECRET_ACCESS_KEY")
 
-s3 = boto3.client(
-    "s3",
-    endpoint_url=R2_ENDPOINT,
-    aws_access_key_id=R2_ACCESS_KEY_ID,
-    aws_secret_access_key=R2_SECRET_ACCESS_KEY,
-    config=Config(signature_version="s3v4")
-)
+R2_REGION = os.getenv("R2_REGION", "us-east-1")  # R2 treats us-east-1 as an alias for "auto"
+PRESIGN_EXPIRES = 3600
+
+@functools.lru_cache(maxsize=1)
+def _r2_signer() -> R2Signer:
+    # Local SigV4 presigning with a per-day cached signing key; no boto3 dispatch per call
+    return R2Signer(R2_ACCESS_KEY_ID, R2_SECRET_ACCESS_KEY, R2_REGION, R2_ENDPOINT, R2_BUCKET_NAME)
+
+def _presign_put(key: str, content_type: Optional[str] = None, query: Optional[Dict[str, Any]] = None) -> str:
+    return _r2_signer().presign_put(key, content_type, query=query, expires=PRESIGN_EXPIRES)
+
+def _upload_key_prefix() -> str:
+    # ULID-style: millisecond timestamp (sortable) + 40 random bits, so two uploads of
+    # the same name in the same second no longer overwrite each other
+    return f"{time.time_ns() // 1_000_000:013x}{secrets.token_hex(5)}"
+
+# Large files are uploaded as concurrent multipart parts instead of one PUT
+# (single PUTs cap at 5 GB and run over one connection)
+MULTIPART_THRESHOLD = 100 * 1024 * 1024
+MULTIPART_PART_SIZE = 16 * 1024 * 1024
+MULTIPART_MAX_PARTS = 10000
+
+@functools.lru_cache(maxsize=1)
+def _r2_client():
+    # Only the multipart create/complete calls need a real client; built on first use
+    import boto3
+    from botocore.config import Config
+    return boto3.client(
+        "s3",
+        endpoint_url=R2_ENDPOINT,
+        aws_access_key_id=R2_ACCESS_KEY_ID,
+        aws_secret_access_key=R2_SECRET_ACCESS_KEY,
+        region_name=R2_REGION,
+        # One pooled, kept-alive client shared by all threads in the worker
+        config=Config(
+            signature_version="s3v4",
+            max_pool_connections=64,
+            tcp_keepalive=True,
+            connect_timeout=3,
+            read_timeout=10,
+            retries={"mode": "adaptive", "max_attempts": 5},
+        ),
+    )
+
+def _presign_multipart(key: str, content_type: str, size: int) -> Dict[str, Any]:
+    part_size = max(MULTIPART_PART_SIZE, -(-size // MULTIPART_MAX_PARTS))
+    part_count = -(-size // part_size)
+    upload_id = _r2_client().create_multipart_upload(
+        Bucket=R2_BUCKET_NAME, Key=key, ContentType=content_type
+    )["UploadId"]
+    return {
+        "upload_id": upload_id,
+        "part_size": part_size,
+        "parts": [
+            {"part_number": n, "upload_url": _presign_put(key, query={"partNumber": n, "uploadId": upload_id})}
+            for n in range(1, part_count + 1)
+        ],
+    }
 
 def _normalize_public_base(base: str, key: str) -> str:
     if not base:
@@ -51,47 +242,252 @@ def _normalize_public_base(base: str, key: str) -> str:
 # ------------------------------------------------------------------------------
 # DB helpers
 # ------------------------------------------------------------------------------
+def _migrate_product_images(conn) -> bool:
+    # One-time conversion of the old comma-joined TEXT column to text[]
+    data_type = conn.execute(text(
+        "SELECT data_type FROM information_schema.columns"
+        " WHERE table_name = 'products' AND column_name = 'product_images'"
+        " AND table_schema = current_schema()"
+    )).scalar()
+    if data_type == "text":
+        conn.execute(text(
+            "ALTER TABLE products ALTER COLUMN product_images TYPE text[]"
+            " USING string_to_array(product_images, ',')"
+        ))
+        return True
+    return False
+
+def _create_missing_indexes(conn) -> bool:
+    # Tables created before the indexes were declared get them here, once
+    existing = {i["name"] for i in inspect(conn).get_indexes(products_table.name)}
+    created = False
+    for index in products_table.indexes:
+        if index.name in existing:
+            continue
+        try:
+            # Savepoint so e.g. duplicate SKUs in old data only skip that index
+            with conn.begin_nested():
+                index.create(conn)
+            created = True
+        except SQLAlchemyError:
+            traceback.print_exc()
+    return created
+
+_TABLE_READY = False
+_TABLE_LOCK = threading.Lock()
+
 def _ensure_products_table():
-    sql = """
-    CREATE TABLE IF NOT EXISTS products (
-      id SERIAL PRIMARY KEY,
-      name TEXT,
-      sku TEXT,
-      category TEXT,
-      price REAL DEFAULT 0,
-      discount_price REAL DEFAULT NULL,
-      inventory INT DEFAULT 0,
-      image_url TEXT,
-      description TEXT,
-      product_images TEXT,
-      specs TEXT
-    );
-    """
-    db.session.execute(text(sql))
-    db.session.commit()
+    # DDL only needs to run once per process; later calls are a flag check
+    global _TABLE_READY
+    if _TABLE_READY:
+        return
+    with _TABLE_LOCK:
+        # Concurrent first requests wait here instead of racing the CREATE
+        if _TABLE_READY:
+            return
+        # Catalog lookup first; CREATE is only sent when the table is missing
+        conn = db.session.connection()
+        changed = False
+        if not conn.dialect.has_table(conn, products_table.name):
+            products_table.create(conn)
+            changed = True
+        if conn.dialect.name == "postgresql":
+            changed = _migrate_product_images(conn) or changed
+        changed = _create_missing_indexes(conn) or changed
+        # Commit only when DDL ran; on an existing schema the lookups just ride along
+        # in the caller's transaction instead of costing a commit of their own
+        if changed:
+            db.session.commit()
+        _TABLE_READY = True
+
+@admin_bp.record_once
+def _bootstrap_schema(state):
+    # Create the table at app start so the first request doesn't pay for the DDL.
+    # Best effort: if the DB is unreachable now, the request path retries via the flag.
+    try:
+        with state.app.app_context():
+            _ensure_products_table()
+    except SQLAlchemyError:
+        traceback.print_exc()
+
+# Built once so SQLAlchemy's compiled cache is hit on every request; Core statements
+# (not text()) so product_images goes through the column type in both directions
+_LIST_PRODUCTS_SQL = select(products_table).order_by(products_table.c.id.desc())
+# Plain str keys (Column names are quoted_name, which orjson rejects as dict keys)
+_PRODUCT_KEYS = tuple(str(c.name) for c in products_table.columns)
+MAX_LIST_LIMIT = 1000
+LIST_YIELD_PER = 200
+
+def _product_row_to_dict(r) -> Dict[str, Any]:
+    item = dict(zip(_PRODUCT_KEYS, r))
+    if item["product_images"] is None:
+        item["product_images"] = []
+    # Map snake_case to camelCase for frontend
+    item["discountPrice"] = item["discount_price"]
+    return item
+
+# Listing projection for paged requests; description/specs/images come from the detail route
+_c = products_table.c
+_PAGE_COLUMNS = (_c.id, _c.name, _c.sku, _c.category, _c.price, _c.discount_price, _c.image_url, _c.inventory)
+_PAGE_KEYS = tuple(str(c.name) for c in _PAGE_COLUMNS)
+_PAGE_PRODUCTS_SQL = select(*_PAGE_COLUMNS).order_by(_c.id.desc())
+_GET_PRODUCT_SQL = select(products_table).where(_c.id == bindparam("id"))
+DEFAULT_PAGE_LIMIT = 50
+
+def _page_products() -> Response:
+    # Keyset page: WHERE id < after_id uses the primary key index, no OFFSET scan
+    limit = max(1, min(request.args.get("limit", DEFAULT_PAGE_LIMIT, type=int), MAX_LIST_LIMIT))
+    after_id = request.args.get("after_id", type=int)
+    stmt = _PAGE_PRODUCTS_SQL
+    if after_id is not None:
+        stmt = stmt.where(_c.id < after_id)
+    # One extra row tells us whether another page exists
+    rows = db.session.execute(stmt.limit(limit + 1)).all()
+    items = []
+    for r in rows[:limit]:
+        item = dict(zip(_PAGE_KEYS, r))
+        item["discountPrice"] = item["discount_price"]
+        items.append(item)
+    next_after = items[-1]["id"] if len(rows) > limit else None
+    return jsonify({"items": items, "next_after": next_after})
+
+def _list_products() -> Response:
+    _ensure_products_table()
+    # ?limit= / ?after_id= switch to a paged, projected listing; bare requests
+    # keep returning the full catalog array
+    if "limit" in request.args or "after_id" in request.args:
+        return _page_products()
+
+    def generate():
+        # Rows are fetched in batches (server-side cursor on Postgres) and encoded one
+        # at a time, so memory stays flat no matter how large the catalog gets
+        rows = db.session.execute(_LIST_PRODUCTS_SQL.execution_options(yield_per=LIST_YIELD_PER))
+        sep = b"["
+        for r in rows:
+            yield sep + orjson.dumps(_product_row_to_dict(r))
+            sep = b","
+        yield b"]" if sep == b"," else b"[]"
+
+    return Response(stream_with_context(generate()), mimetype="application/json")
+
+# Public catalog body cache. Writes in this process bump the local version; with
+# Redis, every write also bumps the shared version, so all workers drop their copy
+# on the next request and share one rebuilt body. Without Redis, the TTL bounds how
+# long other workers keep serving a body from before someone else's write.
+# The ETag is a digest of the body, so every worker agrees on it for the same data.
+PUBLIC_CACHE_TTL = 30
+_products_version = itertools.count()
+_current_version = next(_products_version)
+_public_cache: Optional[Tuple[Tuple[int, Optional[int]], float, str, bytes]] = None
+
+def _bump_products_version():
+    global _current_version
+    _current_version = next(_products_version)
+    catalog_cache.bump()
 
-def _insert_product(p: Dict[str, Any]) -> int:
+def _public_catalog() -> Tuple[str, bytes]:
+    global _public_cache
+    shared_version = catalog_cache.version()
+    version = (_current_version, shared_version)
+    cached = _public_cache
+    if cached is not None and cached[0] == version and cached[1] > time.monotonic():
+        return cached[2], cached[3]
+    hit = catalog_cache.get(shared_version) if shared_version is not None else None
+    if hit is not None:
+        etag, body = hit
+    else:
+        rows = db.session.execute(_LIST_PRODUCTS_SQL)
+        body = orjson.dumps([_product_row_to_dict(r) for r in rows])
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        if shared_version is not None:
+            catalog_cache.put(shared_version, etag, body)
+    _public_cache = (version, time.monotonic() + PUBLIC_CACHE_TTL, etag, body)
+    return etag, body
+
+# Decoders are built once; each decode parses and validates the body in one C pass
+_product_decoder = msgspec.json.Decoder(ProductIn)
+_bulk_products_decoder = msgspec.json.Decoder(BulkProductsIn)
+
+_UPDATE_PRODUCT_COPY_SQL = text("UPDATE products SET description = :description, specs = :specs WHERE id = :id")
+
+def _apply_batch_descriptions(results: Dict[str, Any]) -> int:
+    """Write Batch API output back to products (custom_id is the product id)."""
+    params = []
+    for custom_id, content in results.items():
+        try:
+            parsed = json.loads(content or "{}")
+        except ValueError:
+            continue
+        params.append({
+            "id": int(custom_id),
+            "description": (parsed.get("description") or "").strip(),
+            "specs": (parsed.get("specs") or "").strip(),
+        })
+    if params:
+        _ensure_products_table()
+        db.session.execute(_UPDATE_PRODUCT_COPY_SQL, params)
+        db.session.commit()
+        _bump_products_version()
+    return len(params)
+
+def _insert_product(p: ProductIn) -> int:
     _ensure_products_table()
-    ins = text("""
-      INSERT INTO products (name, sku, category, price, discount_price, inventory, image_url, description, product_images, specs)
-      VALUES (:name, :sku, :category, :price, :discount_price, :inventory, :image_url, :description, :product_images, :specs)
-    """)
-    db.session.execute(ins, {
-        "name": (p.get("name") or "").strip(),
-        "sku": (p.get("sku") or "").strip(),
-        "category": (p.get("category") or "").strip(),
-        "price": float(p.get("price") or 0),
-        "discount_price": float(p.get("discountPrice") or 0) if p.get("discountPrice") else None,
-        "inventory": int(p.get("inventory") or 0),
-        "image_url": (p.get("image_url") or "").strip(),
-        "description": (p.get("description") or "").strip(),
-        "product_images": ",".join(p.get("product_images", [])),
-        "specs": (p.get("specs") or "").strip(),
-    })
+    row_id = db.session.execute(INSERT_PRODUCT, msgspec.structs.asdict(p)).scalar_one()
     db.session.commit()
-    row_id = db.session.execute(text("SELECT lastval()")).scalar_one()
+    _bump_products_version()
     return int(row_id)
 
+MAX_BULK_PRODUCTS = 5000
+
+_COPY_COLUMNS = tuple(str(c.name) for c in products_table.columns)
+_COPY_PRODUCTS_SQL = f"COPY products ({', '.join(_COPY_COLUMNS)}) FROM STDIN"
+_RESERVE_IDS_SQL = text("SELECT nextval(pg_get_serial_sequence('products', 'id')) FROM generate_series(1, :n)")
+
+def _copy_products(conn, rows) -> list:
+    import psycopg
+
+    # Ids are drawn from the sequence up front since COPY can't return them
+    ids = conn.execute(_RESERVE_IDS_SQL, {"n": len(rows)}).scalars().all()
+    raw = conn.connection.driver_connection
+    try:
+        with raw.cursor() as cur, cur.copy(_COPY_PRODUCTS_SQL) as copy:
+            for row_id, row in zip(ids, rows):
+                row["id"] = row_id
+                copy.write_row(tuple(row[c] for c in _COPY_COLUMNS))
+    except psycopg.errors.IntegrityError as e:
+        # The raw cursor bypasses SQLAlchemy's exception wrapping; re-raise as the
+        # IntegrityError the route maps to 409 (duplicate SKU)
+        raise IntegrityError(_COPY_PRODUCTS_SQL, None, e) from e
+    return ids
+
+def _insert_products(products: List[ProductIn]) -> list:
+    _ensure_products_table()
+    rows = [msgspec.structs.asdict(p) for p in products]
+    conn = db.session.connection()
+    if conn.dialect.driver == "psycopg":
+        # COPY FROM STDIN streams rows without per-statement parse/plan overhead
+        ids = _copy_products(conn, rows)
+    else:
+        ids = db.session.execute(BULK_INSERT_PRODUCTS, rows).scalars().all()
+    # One transaction (and one fsync) for the whole import
+    db.session.commit()
+    _bump_products_version()
+    return [int(i) for i in ids]
+
+# ------------------------------------------------------------------------------
+# Request helpers
+# ------------------------------------------------------------------------------
+def _json_body():
+    # silent: malformed bodies come back as None instead of raising into the 500 handler
+    data = request.get_json(force=True, silent=True)
+    if data is None:
+        # An empty body means "no fields"; anything unparseable is rejected
+        return None if request.get_data() else {}
+    return data if isinstance(data, dict) else None
+
+def _invalid_json():
+    return jsonify(error="ValidationError", message="Request body must be a JSON object"), 400
+
 # ------------------------------------------------------------------------------
 # Routes
 # ------------------------------------------------------------------------------
@@ -103,21 +499,28 @@ def ping():
 @admin_bp.post("/images/presign")
 def presign_image():
     try:
-        data = request.get_json(force=True) or {}
-        file_name = data.get("fileName")
+        data = _json_body()
+        if data is None:
+            return _invalid_json()
+        # Client-supplied names can carry "../", slashes or control characters into the key
+        file_name = secure_filename(data.get("fileName") or "") or "upload"
         content_type = data.get("contentType", "application/octet-stream")
-        folder = data.get("folder", "").strip()
-        timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
-        key = f"{folder}/{timestamp}_{file_name}" if folder else f"{timestamp}_{file_name}"
-
-        presigned_url = s3.generate_presigned_url(
-            "put_object",
-            Params={"Bucket": R2_BUCKET_NAME, "Key": key, "ContentType": content_type},
-            ExpiresIn=3600,
-        )
+        # Same for each segment of the folder; "..", "." and empty segments drop out
+        folder = "/".join(filter(None, (secure_filename(part) for part in str(data.get("folder") or "").split("/"))))
+        prefix = _upload_key_prefix()
+        key = f"{folder}/{prefix}_{file_name}" if folder else f"{prefix}_{file_name}"
 
         public_url = _normalize_public_base(R2_PUBLIC_BASE, key)
 
+        size = data.get("size")
+        if isinstance(size, int) and size > MULTIPART_THRESHOLD:
+            # Client PUTs each part concurrently, then calls /images/complete with the ETags
+            result = _presign_multipart(key, content_type, size)
+            result.update(public_url=public_url, key=key)
+            return jsonify(result)
+
+        presigned_url = _presign_put(key, content_type)
+
         return jsonify({
             "upload_url": presigned_url,
             "public_url": public_url,
@@ -127,13 +530,48 @@ def presign_image():
         traceback.print_exc()
         return jsonify(error="ServerError", message=str(e)), 500
 
+# --- Multipart Upload Complete ---
+@admin_bp.post("/images/complete")
+def complete_image_upload():
+    try:
+        data = _json_body()
+        if data is None:
+            return _invalid_json()
+        key = data.get("key")
+        upload_id = data.get("upload_id")
+        parts = data.get("parts")
+        if not key or not upload_id or not isinstance(parts, list) or not parts:
+            return jsonify(error="ValidationError", message="key, upload_id and parts are required"), 400
+
+        _r2_client().complete_multipart_upload(
+            Bucket=R2_BUCKET_NAME,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": sorted(
+                ({"ETag": p.get("etag") or p.get("ETag"), "PartNumber": int(p.get("part_number") or p.get("PartNumber"))}
+                 for p in parts),
+                key=lambda p: p["PartNumber"],
+            )},
+        )
+        return jsonify({"key": key, "public_url": _normalize_public_base(R2_PUBLIC_BASE, key)})
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify(error="ServerError", message=str(e)), 500
+
 # --- Create Product ---
 @admin_bp.post("/products")
 def create_product():
     try:
-        data = request.get_json(force=True) or {}
-        new_id = _insert_product(data)
+        try:
+            # An empty body still means "no fields", as before
+            product = _product_decoder.decode(request.get_data() or b"{}")
+        except msgspec.DecodeError as e:
+            return jsonify(error="ValidationError", message=str(e)), 400
+        new_id = _insert_product(product)
         return jsonify({"id": new_id}), 201
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify(error="Conflict", message="A product with this SKU already exists"), 409
     except SQLAlchemyError as e:
         db.session.rollback()
         traceback.print_exc()
@@ -142,38 +580,72 @@ def create_product():
         traceback.print_exc()
         return jsonify(error="ServerError", message=str(e)), 500
 
+# --- Bulk Create Products ---
+@admin_bp.post("/products/bulk")
+def create_products_bulk():
+    try:
+        try:
+            products = _bulk_products_decoder.decode(request.get_data()).products
+        except msgspec.DecodeError as e:
+            return jsonify(error="ValidationError", message=str(e)), 400
+        if len(products) > MAX_BULK_PRODUCTS:
+            return jsonify(error="ValidationError", message=f"At most {MAX_BULK_PRODUCTS} products per request"), 400
+        new_ids = _insert_products(products) if products else []
+        return jsonify({"ids": new_ids, "count": len(new_ids)}), 201
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify(error="Conflict", message="Duplicate SKU in import or already in the catalog"), 409
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        traceback.print_exc()
+        return jsonify(error=type(e).__name__, message=str(e)), 500
+    except Exception as e:
+        # A driver error mid-COPY leaves the transaction aborted
+        db.session.rollback()
+        traceback.print_exc()
+        return jsonify(error="ServerError", message=str(e)), 500
+
 # --- List Products (admin) ---
 @admin_bp.get("/products")
 def list_products_admin():
+    return _list_products()
+
+# --- Product Detail ---
+@admin_bp.get("/products/<int:product_id>")
+def get_product_admin(product_id):
     _ensure_products_table()
-    rows = db.session.execute(text("SELECT * FROM products ORDER BY id DESC")).mappings().all()
-    results = []
-    for r in rows:
-        item = dict(r)
-        item["product_images"] = item.get("product_images", "").split(",") if item.get("product_images") else []
-        # Map snake_case to camelCase for frontend
-        item["discountPrice"] = item.get("discount_price")
-        results.append(item)
-    return jsonify(results)
+    row = db.session.execute(_GET_PRODUCT_SQL, {"id": product_id}).first()
+    if row is None:
+        return jsonify(error="NotFound", message="Product not found"), 404
+    return jsonify(_product_row_to_dict(row))
 
 # --- Public Catalog ---
 @admin_bp.get("/public")
 def list_products_public():
+    if "limit" in request.args or "after_id" in request.args:
+        return _list_products()
     _ensure_products_table()
-    rows = db.session.execute(text("SELECT * FROM products ORDER BY id DESC")).mappings().all()
-    results = []
-    for r in rows:
-        item = dict(r)
-        item["product_images"] = item.get("product_images", "").split(",") if item.get("product_images") else []
-        item["discountPrice"] = item.get("discount_price")
-        results.append(item)
-    return jsonify(results)
-
-# --- AI Description (unchanged) ---
+    etag, body = _public_catalog()
+    cache_control = f"public, max-age={PUBLIC_CACHE_TTL}"
+    # Flask-Compress sends the tag back as "<etag>:gzip" / ":br", so compare the base part
+    for tag in request.if_none_match.as_set(include_weak=True):
+        if tag.split(":", 1)[0] == etag:
+            response = Response(status=304)
+            response.set_etag(tag)
+            response.headers["Cache-Control"] = cache_control
+            return response
+    response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = cache_control
+    return response
+
+# --- AI Description ---
 @admin_bp.post("/ai/describe")
 def ai_describe():
     try:
-        data = request.get_json(force=True) or {}
+        data = _json_body()
+        if data is None:
+            return _invalid_json()
         image_url = data.get("image_url")
         price = data.get("price", "")
         inventory = data.get("inventory", "")
@@ -181,48 +653,94 @@ def ai_describe():
         if not image_url:
             return jsonify(error="ValidationError", message="image_url is required"), 400
 
-        system_prompt = (
-            "You are a product data extractor and copywriter for an automotive parts catalog.\n"
-            "Analyze a product description/spec image and return ONLY valid JSON in this schema:\n\n"
-            "{\n"
-            '  "name": string,\n'
-            '  "category": string,\n'
-            '  "sku": string,\n'
-            '  "specs": string (markdown bullet list, bold labels),\n'
-            '  "description": string (markdown, 2+ paragraphs, professional tone, identifiers bold)\n'
-            "}"
-        )
+        if not AI_ENABLED:
+            return jsonify(error="AIUnavailable", message="AI description is not configured"), 503
 
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            response_format={"type": "json_object"},
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": "Extract fields and generate specs + description for this product image."},
-                        {"type": "image_url", "image_url": {"url": image_url}},
-                    ],
-                },
-            ],
-            max_tokens=800,
-            temperature=0.4,
-        )
+        # Opt-in: hand the OpenAI round-trip to the queue and let the client poll
+        if data.get("async") and AI_QUEUE_ENABLED:
+            # By dotted path: the worker imports this module and hits the same caches
+            job = _ai_queue().enqueue(
+                f"{__name__}._describe_image", image_url,
+                job_timeout=AI_JOB_TIMEOUT, result_ttl=AI_RESULT_TTL,
+                meta={"price": price, "inventory": inventory},
+            )
+            return jsonify({"job_id": job.id, "status": "pending"}), 202
 
-        raw = resp.choices[0].message.content or "{}"
-        parsed = json.loads(raw) if isinstance(raw, str) else raw
+        return jsonify(_describe_response(_describe_image(image_url), price, inventory))
 
-        return jsonify({
-            "name": parsed.get("name"),
-            "category": parsed.get("category"),
-            "sku": parsed.get("sku"),
-            "specs": parsed.get("specs"),
-            "description": parsed.get("description"),
-            "price": price,
-            "inventory": inventory
-        })
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify(error="ServerError", message=str(e)), 500
+
+@admin_bp.post("/ai/describe/batch")
+def ai_describe_batch():
+    try:
+        data = _json_body()
+        items = data.get("items") if data is not None else None
+        if not isinstance(items, list) or not all(isinstance(i, dict) and i.get("image_url") for i in items):
+            return jsonify(error="ValidationError", message="items must be a list of objects with image_url"), 400
+        if len(items) > MAX_DESCRIBE_BATCH:
+            return jsonify(error="ValidationError", message=f"At most {MAX_DESCRIBE_BATCH} items per request"), 400
+
+        if not AI_ENABLED:
+            return jsonify(error="AIUnavailable", message="AI description is not configured"), 503
+
+        return jsonify({"results": _describe_many(items)})
+
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify(error="ServerError", message=str(e)), 500
+
+# --- AI Descriptions via Batch API (bulk imports) ---
+_BATCH_PENDING = {"validating", "in_progress", "finalizing", "cancelling"}
+
+@admin_bp.post("/ai/batches")
+def ai_batch_submit():
+    try:
+        data = _json_body()
+        products = data.get("products") if data is not None else None
+        if not isinstance(products, list) or not products or not all(
+            isinstance(p, dict) and isinstance(p.get("id"), int) and p.get("image_url") for p in products
+        ):
+            return jsonify(error="ValidationError", message="products must be a non-empty list of {id, image_url}"), 400
+
+        if not AI_ENABLED:
+            return jsonify(error="AIUnavailable", message="AI description is not configured"), 503
+
+        bodies = {str(p["id"]): _describe_request_body(p["image_url"]) for p in products}
+        batch_id = openai_batch.submit_batch(_openai_client(), bodies)
+        return jsonify({"batch_id": batch_id, "status": "validating", "count": len(bodies)}), 202
 
     except Exception as e:
         traceback.print_exc()
         return jsonify(error="ServerError", message=str(e)), 500
+
+@admin_bp.get("/ai/batches/<batch_id>")
+def ai_batch_status(batch_id):
+    try:
+        if not AI_ENABLED:
+            return jsonify(error="AIUnavailable", message="AI description is not configured"), 503
+
+        status, results = openai_batch.fetch_results(_openai_client(), batch_id)
+        if status in _BATCH_PENDING:
+            return jsonify({"batch_id": batch_id, "status": status}), 202
+        if results is None:
+            return jsonify({"batch_id": batch_id, "status": status})
+
+        # Safe to poll again after completion; the UPDATEs just rewrite the same text
+        updated = _apply_batch_descriptions(results)
+        return jsonify({"batch_id": batch_id, "status": status, "updated": updated})
+
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        traceback.print_exc()
+        return jsonify(error=type(e).__name__, message=str(e)), 500
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify(error="ServerError", message=str(e)), 500
+
+@admin_bp.get("/ai/describe/<job_id>")
+def ai_describe_status(job_id):
+    if AI_QUEUE_ENABLED:
+        return _queued_job_status(job_id)
+    return jsonify(error="NotFound", message="Unknown job_id"), 404
@@ -1,4 +1,6 @@
 from flask import Blueprint, request, jsonify, session
+from sqlalchemy import func, inspect, text, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from src.models.user import db
 from src.models.product import Product
 from src.models.order import Cart, CartItem
@@ -12,15 +14,70 @@ def get_or_create_session_id():
         session['session_id'] = str(uuid.uuid4())
     return session['session_id']
 
+def get_session_cart_id():
+    """Get the session's cart ID without creating a cart (None if there is none)"""
+    cart_id = session.get('cart_id')
+    if cart_id is None and 'session_id' in session:
+        # Sessions from before the cart ID was stored: look it up once and keep it
+        cart_id = db.session.query(Cart.id).filter_by(
+            session_id=session['session_id']
+        ).limit(1).scalar()
+        if cart_id is not None:
+            session['cart_id'] = cart_id
+    return cart_id
+
+def get_session_cart():
+    """Get the session's cart by primary key, or None"""
+    cart_id = get_session_cart_id()
+    return db.session.get(Cart, cart_id) if cart_id is not None else None
+
 def get_or_create_cart(session_id, user_id=None):
     """Get or create a cart for the session/user"""
-    cart = Cart.query.filter_by(session_id=session_id).first()
+    cart = get_session_cart()
     if not cart:
         cart = Cart(session_id=session_id, user_id=user_id)
         db.session.add(cart)
         db.session.commit()
+    # Remember the ID so later requests fetch by primary key (or skip the DB entirely)
+    session['cart_id'] = cart.id
     return cart
 
+def _bump_cart_line(cart_id, product_id, quantity):
+    """Add quantity to the cart's line for the product; its new quantity, or None if there is no line"""
+    return db.session.execute(
+        update(CartItem)
+        .where(CartItem.cart_id == cart_id, CartItem.product_id == product_id)
+        .values(quantity=CartItem.quantity + quantity, updated_at=db.func.now())
+        .returning(CartItem.quantity)
+    ).scalar()
+
+def _has_cart_line_key(conn):
+    # As a table constraint or a unique index, whichever the database was created with
+    inspector = inspect(conn)
+    keys = inspector.get_unique_constraints(CartItem.__tablename__) + [
+        index for index in inspector.get_indexes(CartItem.__tablename__) if index['unique']
+    ]
+    return any(set(key['column_names']) == {'cart_id', 'product_id'} for key in keys)
+
+@cart_bp.record_once
+def _bootstrap_schema(state):
+    # Carts created before uq_cart_item_product get it as a unique index, so the
+    # add-to-cart fallback above works there too. Best effort: existing duplicate
+    # lines make it fail, which is logged for manual cleanup.
+    with state.app.app_context():
+        try:
+            conn = db.session.connection()
+            if conn.dialect.has_table(conn, CartItem.__tablename__) and not _has_cart_line_key(conn):
+                conn.execute(text(
+                    "CREATE UNIQUE INDEX uq_cart_item_product ON cart_items (cart_id, product_id)"
+                ))
+                db.session.commit()
+        except SQLAlchemyError:
+            db.session.rollback()
+            state.app.logger.exception('Cart schema bootstrap failed')
+        finally:
+            db.session.remove()
+
 @cart_bp.route('', methods=['GET'])
 def get_cart():
     """Get the current cart contents"""
@@ -61,29 +118,28 @@ def add_to_cart():
         session_id = get_or_create_session_id()
         cart = get_or_create_cart(session_id)
         
-        # Check if item already exists in cart
-        existing_item = CartItem.query.filter_by(
-            cart_id=cart.id,
-            product_id=product_id
-        ).first()
-        
-        if existing_item:
-            # Update quantity
-            new_quantity = existing_item.quantity + quantity
-            if new_quantity > product.quantity:
-                return jsonify({'error': f'Only {product.quantity} items available'}), 400
-            
-            existing_item.quantity = new_quantity
-            existing_item.updated_at = db.func.now()
-        else:
-            # Add new item
-            cart_item = CartItem(
-                cart_id=cart.id,
-                product_id=product_id,
-                quantity=quantity,
-                price=product.price
-            )
-            db.session.add(cart_item)
+        # Bump an existing line in place (one UPDATE, no read-modify-write race);
+        # RETURNING tells us whether the line existed and what it now holds
+        new_quantity = _bump_cart_line(cart.id, product_id, quantity)
+        
+        if new_quantity is None:
+            # Add new item. An UPDATE matching no row takes no lock, so a concurrent
+            # first add can insert the same line; the unique (cart_id, product_id)
+            # index rejects ours and we add to that line instead
+            try:
+                with db.session.begin_nested():
+                    db.session.add(CartItem(
+                        cart_id=cart.id,
+                        product_id=product_id,
+                        quantity=quantity,
+                        price=product.price
+                    ))
+            except IntegrityError:
+                new_quantity = _bump_cart_line(cart.id, product_id, quantity)
+        
+        if new_quantity is not None and new_quantity > product.quantity:
+            db.session.rollback()
+            return jsonify({'error': f'Only {product.quantity} items available'}), 400
         
         # Update cart timestamp
         cart.updated_at = db.func.now()
@@ -112,8 +168,7 @@ def update_cart_item():
         if quantity < 0:
             return jsonify({'error': 'Quantity must be non-negative'}), 400
         
-        session_id = get_or_create_session_id()
-        cart = Cart.query.filter_by(session_id=session_id).first()
+        cart = get_session_cart()
         
         if not cart:
             return jsonify({'error': 'Cart not found'}), 404
@@ -155,8 +210,7 @@ def update_cart_item():
 def remove_from_cart(item_id):
     """Remove an item from the cart"""
     try:
-        session_id = get_or_create_session_id()
-        cart = Cart.query.filter_by(session_id=session_id).first()
+        cart = get_session_cart()
         
         if not cart:
             return jsonify({'error': 'Cart not found'}), 404
@@ -186,8 +240,7 @@ def remove_from_cart(item_id):
 def clear_cart():
     """Clear all items from the cart"""
     try:
-        session_id = get_or_create_session_id()
-        cart = Cart.query.filter_by(session_id=session_id).first()
+        cart = get_session_cart()
         
         if not cart:
             return jsonify({'message': 'Cart is already empty'})
@@ -210,17 +263,17 @@ def clear_cart():
 def get_cart_count():
     """Get the total number of items in the cart"""
     try:
-        session_id = session.get('session_id')
-        if not session_id:
-            return jsonify({'count': 0})
-        
-        cart = Cart.query.filter_by(session_id=session_id).first()
-        if not cart:
+        # Visitors who never touched the cart have no cart ID: answer without a query
+        cart_id = get_session_cart_id()
+        if cart_id is None:
             return jsonify({'count': 0})
         
-        total_items = sum(item.quantity for item in cart.items)
+        # One scalar SUM instead of loading every cart item row
+        total_items = db.session.query(
+            func.coalesce(func.sum(CartItem.quantity), 0)
+        ).filter(CartItem.cart_id == cart_id).scalar()
         
-        return jsonify({'count': total_items})
+        return jsonify({'count': int(total_items)})
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1,29 +1,202 @@
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, current_app, request, jsonify, session
+from sqlalchemy import bindparam, inspect, text, tuple_
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+from sqlalchemy.orm import lazyload, load_only
 from src.models.user import db
-from src.models.product import Product
-from src.models.order import Cart, CartItem, Order, OrderItem
-from datetime import datetime
+from src.models.product import Product, Inventory
+from src.models.order import FROZEN_ORDER_STATUSES, Cart, CartItem, Order, OrderItem, store_rendered_json
+from src.services import response_cache
+from datetime import datetime, timezone
+from decimal import Decimal, ROUND_HALF_UP
+from operator import attrgetter
+import base64
+import binascii
 import uuid
-import random
-import string
+import secrets
+import time
 
 order_bp = Blueprint('order', __name__, url_prefix='/api/orders')
 
+def _add_rendered_json_column(conn) -> bool:
+    # Databases created before Order.rendered_json get the column once
+    if not conn.dialect.has_table(conn, Order.__tablename__):
+        return False
+    if any(c['name'] == 'rendered_json' for c in inspect(conn).get_columns(Order.__tablename__)):
+        return False
+    conn.execute(text("ALTER TABLE orders ADD COLUMN rendered_json TEXT"))
+    return True
+
+@order_bp.record_once
+def _bootstrap_schema(state):
+    # Best effort at app start; a missing column otherwise fails every Order query
+    with state.app.app_context():
+        try:
+            if _add_rendered_json_column(db.session.connection()):
+                db.session.commit()
+        except SQLAlchemyError:
+            state.app.logger.exception('Order schema bootstrap failed')
+        finally:
+            db.session.remove()
+
+# Largest admin order page; each order carries its items
+MAX_PER_PAGE = 100
+
+# Dashboard stats are polled; a few seconds of staleness is fine and writes bump it
+ORDER_STATS_CACHE_TTL = 30
+
 def generate_order_number():
     """Generate a unique order number"""
-    timestamp = datetime.now().strftime('%Y%m%d')
-    random_suffix = ''.join(random.choices(string.digits, k=4))
-    return f"MET-{timestamp}-{random_suffix}"
+    # UUIDv7-style suffix: millisecond of the (UTC) day, so numbers sort by time,
+    # plus 24 random bits, so same-millisecond orders don't collide either
+    ms = time.time_ns() // 1_000_000
+    date = datetime.fromtimestamp(ms / 1000, timezone.utc)
+    return f"MET-{date:%Y%m%d}-{ms % 86_400_000:07X}{secrets.token_hex(3).upper()}"
+
+# Money stays Decimal end to end (Numeric columns come back as Decimal), rounded
+# half-up to the cent, so totals match what the database stores
+CENT = Decimal('0.01')
+TAX_RATE = Decimal('0.08')
+FREE_SHIPPING_THRESHOLD = Decimal('500.00')
+FLAT_SHIPPING = Decimal('25.00')
+NO_CHARGE = Decimal('0.00')
 
-def calculate_tax(subtotal, tax_rate=0.08):
+def calculate_tax(subtotal, tax_rate=TAX_RATE):
     """Calculate tax amount (8% default)"""
-    return round(float(subtotal) * tax_rate, 2)
+    return (subtotal * tax_rate).quantize(CENT, ROUND_HALF_UP)
 
-def calculate_shipping(subtotal, free_shipping_threshold=500.00):
+def calculate_shipping(subtotal, free_shipping_threshold=FREE_SHIPPING_THRESHOLD):
     """Calculate shipping cost"""
-    if float(subtotal) >= free_shipping_threshold:
-        return 0.00
-    return 25.00  # Flat rate shipping
+    if subtotal >= free_shipping_threshold:
+        return NO_CHARGE
+    return FLAT_SHIPPING  # Flat rate shipping
+
+def encode_order_cursor(order):
+    """Opaque keyset cursor for the (created_at, id) position of an order"""
+    raw = f"{order.created_at.isoformat()}|{order.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_order_cursor(cursor):
+    """Inverse of encode_order_cursor; raises ValueError on a malformed cursor"""
+    try:
+        created_at, order_id = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit('|', 1)
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValueError('Invalid cursor')
+    return datetime.fromisoformat(created_at), int(order_id)
+
+# Checkout payload fields copied onto the Order (customer, billing, shipping, payment)
+REQUIRED_ORDER_FIELDS = (
+    'customer_email', 'customer_name',
+    'billing_address_line1', 'billing_city', 'billing_state', 'billing_zip',
+    'shipping_address_line1', 'shipping_city', 'shipping_state', 'shipping_zip'
+)
+OPTIONAL_ORDER_FIELDS = ('customer_phone', 'billing_address_line2', 'shipping_address_line2')
+DEFAULTED_ORDER_FIELDS = (
+    ('billing_country', 'US'),
+    ('shipping_country', 'US'),
+    ('payment_method', 'credit_card')
+)
+
+def _order_fields(data):
+    """Order column values taken from a validated checkout payload"""
+    return (
+        {field: data[field] for field in REQUIRED_ORDER_FIELDS}
+        | {field: data.get(field) for field in OPTIONAL_ORDER_FIELDS}
+        | {field: data.get(field, default) for field, default in DEFAULTED_ORDER_FIELDS}
+    )
+
+# Checkout writes, built once and sent with a list of parameter sets
+_INSERT_ORDER_ITEMS = OrderItem.__table__.insert()
+_inventory = Inventory.__table__
+_DECREMENT_STOCK = _inventory.update().where(
+    _inventory.c.product_id == bindparam('pid')
+).where(
+    _inventory.c.on_hand >= bindparam('qty')
+).values(on_hand=_inventory.c.on_hand - bindparam('qty'))
+
+def _stock_error(lines):
+    """Error response naming the first cart line that stock can't cover"""
+    on_hand = dict(db.session.query(Inventory.product_id, Inventory.on_hand).filter(
+        Inventory.product_id.in_([item.product_id for item in lines])
+    ).all())
+    for item in lines:
+        available = on_hand.get(item.product_id) or 0
+        if available <= 0:
+            return jsonify({'error': f'Product {item.product.title} is out of stock'}), 400
+        if item.quantity > available:
+            return jsonify({'error': f'Only {available} of {item.product.title} available'}), 400
+    # Stock was short a moment ago but has been restored since
+    return jsonify({'error': 'Stock changed during checkout, please try again'}), 409
+
+# deadlock_detected, serialization_failure
+RETRYABLE_SQLSTATES = frozenset(('40P01', '40001'))
+
+def _place_order(data, session_id):
+    """Turn the session's cart into an order; returns the response"""
+    # Lock the cart so a double-submitted checkout waits here instead of ordering twice
+    cart = Cart.query.filter_by(session_id=session_id).with_for_update().first()
+    if not cart or not cart.items:
+        return jsonify({'error': 'Cart is empty'}), 400
+    
+    # Check and take stock in the same statement: each UPDATE only applies while
+    # enough is on hand, so nothing can sell the units between check and write.
+    # Lines go in product_id order so concurrent checkouts lock rows in one order.
+    lines = sorted(cart.items, key=attrgetter('product_id'))
+    decremented = db.session.execute(_DECREMENT_STOCK, [
+        {'pid': item.product_id, 'qty': item.quantity} for item in lines
+    ]).rowcount
+    if decremented != len(lines):
+        db.session.rollback()
+        return _stock_error(lines)
+    
+    # Calculate totals
+    subtotal = sum((item.quantity * item.price for item in cart.items), NO_CHARGE)
+    tax_amount = calculate_tax(subtotal)
+    shipping_amount = calculate_shipping(subtotal)
+    discount_amount = NO_CHARGE  # TODO: Implement discount logic
+    total_amount = subtotal + tax_amount + shipping_amount - discount_amount
+    
+    # Create order
+    order = Order(
+        order_number=generate_order_number(),
+        session_id=session_id,
+        **_order_fields(data),
+        
+        # Totals
+        subtotal=subtotal,
+        tax_amount=tax_amount,
+        shipping_amount=shipping_amount,
+        discount_amount=discount_amount,
+        total_amount=total_amount,
+        
+        payment_status='pending'
+    )
+    
+    db.session.add(order)
+    db.session.flush()  # Get order ID
+    
+    # Create order items: one multi-row INSERT instead of a unit-of-work entry per item
+    db.session.execute(_INSERT_ORDER_ITEMS, [{
+        'order_id': order.id,
+        'product_id': cart_item.product_id,
+        'product_sku': cart_item.product.sku,
+        'product_title': cart_item.product.title,
+        'product_brand': cart_item.product.brand,
+        'quantity': cart_item.quantity,
+        'unit_price': cart_item.price,
+        'total_price': cart_item.quantity * cart_item.price
+    } for cart_item in cart.items])
+    
+    # Clear cart
+    CartItem.query.filter_by(cart_id=cart.id).delete()
+    
+    db.session.commit()
+    # New order changes the stats; the stock change shows in product listings
+    response_cache.bump('orders', 'products')
+    
+    return jsonify({
+        'message': 'Order created successfully',
+        'order': order.to_dict()
+    }), 201
 
 @order_bp.route('/checkout', methods=['POST'])
 def create_order():
@@ -31,107 +204,25 @@ def create_order():
     try:
         data = request.get_json()
         
-        # Validate required fields
-        required_fields = [
-            'customer_email', 'customer_name',
-            'billing_address_line1', 'billing_city', 'billing_state', 'billing_zip',
-            'shipping_address_line1', 'shipping_city', 'shipping_state', 'shipping_zip'
-        ]
-        
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({'error': f'{field} is required'}), 400
+        # Validate required fields, reporting every missing one at once
+        missing = [field for field in REQUIRED_ORDER_FIELDS if not data.get(field)]
+        if missing:
+            verb = 'is' if len(missing) == 1 else 'are'
+            return jsonify({'error': f"{', '.join(missing)} {verb} required", 'missing_fields': missing}), 400
         
         # Get cart
         session_id = session.get('session_id')
         if not session_id:
             return jsonify({'error': 'No active cart found'}), 400
         
-        cart = Cart.query.filter_by(session_id=session_id).first()
-        if not cart or not cart.items:
-            return jsonify({'error': 'Cart is empty'}), 400
-        
-        # Validate cart items availability
-        for item in cart.items:
-            if not item.product.in_stock:
-                return jsonify({'error': f'Product {item.product.title} is out of stock'}), 400
-            if item.quantity > item.product.quantity:
-                return jsonify({'error': f'Only {item.product.quantity} of {item.product.title} available'}), 400
-        
-        # Calculate totals
-        subtotal = sum(item.quantity * item.price for item in cart.items)
-        tax_amount = calculate_tax(subtotal)
-        shipping_amount = calculate_shipping(subtotal)
-        discount_amount = 0  # TODO: Implement discount logic
-        total_amount = subtotal + tax_amount + shipping_amount - discount_amount
-        
-        # Create order
-        order = Order(
-            order_number=generate_order_number(),
-            session_id=session_id,
-            customer_email=data['customer_email'],
-            customer_name=data['customer_name'],
-            customer_phone=data.get('customer_phone'),
-            
-            # Billing address
-            billing_address_line1=data['billing_address_line1'],
-            billing_address_line2=data.get('billing_address_line2'),
-            billing_city=data['billing_city'],
-            billing_state=data['billing_state'],
-            billing_zip=data['billing_zip'],
-            billing_country=data.get('billing_country', 'US'),
-            
-            # Shipping address
-            shipping_address_line1=data['shipping_address_line1'],
-            shipping_address_line2=data.get('shipping_address_line2'),
-            shipping_city=data['shipping_city'],
-            shipping_state=data['shipping_state'],
-            shipping_zip=data['shipping_zip'],
-            shipping_country=data.get('shipping_country', 'US'),
-            
-            # Totals
-            subtotal=subtotal,
-            tax_amount=tax_amount,
-            shipping_amount=shipping_amount,
-            discount_amount=discount_amount,
-            total_amount=total_amount,
-            
-            # Payment info
-            payment_method=data.get('payment_method', 'credit_card'),
-            payment_status='pending'
-        )
-        
-        db.session.add(order)
-        db.session.flush()  # Get order ID
-        
-        # Create order items
-        for cart_item in cart.items:
-            order_item = OrderItem(
-                order_id=order.id,
-                product_id=cart_item.product_id,
-                product_sku=cart_item.product.sku,
-                product_title=cart_item.product.title,
-                product_brand=cart_item.product.brand,
-                quantity=cart_item.quantity,
-                unit_price=cart_item.price,
-                total_price=cart_item.quantity * cart_item.price
-            )
-            db.session.add(order_item)
-            
-            # Update product inventory
-            cart_item.product.quantity -= cart_item.quantity
-            if cart_item.product.quantity <= 0:
-                cart_item.product.in_stock = False
-        
-        # Clear cart
-        CartItem.query.filter_by(cart_id=cart.id).delete()
-        
-        db.session.commit()
-        
-        return jsonify({
-            'message': 'Order created successfully',
-            'order': order.to_dict()
-        }), 201
+        for attempt in range(2):
+            try:
+                return _place_order(data, session_id)
+            except OperationalError as e:
+                db.session.rollback()
+                # A deadlock / serialization failure against another writer clears on retry
+                if attempt or getattr(e.orig, 'sqlstate', None) not in RETRYABLE_SQLSTATES:
+                    raise
         
     except Exception as e:
         db.session.rollback()
@@ -145,17 +236,25 @@ def get_order(order_number):
         if not order:
             return jsonify({'error': 'Order not found'}), 404
         
-        return jsonify({'order': order.to_dict()})
+        return jsonify({'order': order.to_json()})
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _orders_response(orders, pagination):
+    # Encoded here, inside the route's try, so a serialization error is a 500 JSON
+    # error rather than a truncated 200; frozen orders pass through as stored fragments
+    return jsonify({
+        'orders': [order.to_json() for order in orders],
+        'pagination': pagination
+    })
+
 @order_bp.route('', methods=['GET'])
 def get_orders():
     """Get orders (admin endpoint)"""
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = min(max(request.args.get('per_page', 20, type=int), 1), MAX_PER_PAGE)
         status = request.args.get('status')
         
         query = Order.query
@@ -163,23 +262,42 @@ def get_orders():
         if status:
             query = query.filter(Order.status == status)
         
-        orders = query.order_by(Order.created_at.desc()).paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
-        
-        return jsonify({
-            'orders': [order.to_dict() for order in orders.items],
-            'pagination': {
-                'page': orders.page,
-                'pages': orders.pages,
-                'per_page': orders.per_page,
-                'total': orders.total,
-                'has_next': orders.has_next,
-                'has_prev': orders.has_prev
-            }
-        })
+        # ?cursor= switches to keyset paging on (created_at, id), newest first: each
+        # page is an index seek past the previous one, with no OFFSET and no COUNT(*)
+        cursor = request.args.get('cursor')
+        if cursor is not None:
+            if cursor:
+                try:
+                    position = decode_order_cursor(cursor)
+                except ValueError:
+                    return jsonify({'error': 'Invalid cursor'}), 400
+                query = query.filter(tuple_(Order.created_at, Order.id) < position)
+            rows = query.order_by(Order.created_at.desc(), Order.id.desc()).limit(per_page + 1).all()
+            page_items = rows[:per_page]
+            has_next = len(rows) > per_page
+            return _orders_response(page_items, {
+                'per_page': per_page,
+                'has_next': has_next,
+                'next_cursor': encode_order_cursor(page_items[-1]) if has_next else None
+            })
+        
+        # Offset paging with a one-row peek for has_next; the COUNT(*) behind
+        # total/pages only runs when the client asks for it
+        rows = query.order_by(Order.created_at.desc(), Order.id.desc()).offset(
+            (page - 1) * per_page
+        ).limit(per_page + 1).all()
+        pagination = {
+            'page': page,
+            'per_page': per_page,
+            'has_next': len(rows) > per_page,
+            'has_prev': page > 1
+        }
+        if request.args.get('include_total', type=int):
+            total = query.order_by(None).count()
+            pagination['total'] = total
+            pagination['pages'] = -(-total // per_page)
+        
+        return _orders_response(rows[:per_page], pagination)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -213,51 +331,76 @@ def update_order_status(order_id):
             order.delivered_at = datetime.utcnow()
         
         db.session.commit()
+        response_cache.bump('orders')
+        
+        order_data = order.to_dict()
+        if order.status in FROZEN_ORDER_STATUSES:
+            try:
+                store_rendered_json(order, order_data)
+                db.session.commit()
+            except SQLAlchemyError:
+                # Only a shortcut for reads; the status change itself is committed
+                db.session.rollback()
+                current_app.logger.exception('Could not store rendered JSON for order %s', order_id)
         
         return jsonify({
             'message': f'Order status updated to {new_status}',
-            'order': order.to_dict()
+            'order': order_data
         })
         
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+REVENUE_STATUSES = frozenset(('confirmed', 'processing', 'shipped', 'delivered'))
+
+def _order_stats():
+    """Stats payload for the admin dashboard"""
+    # Counts and totals for every status in one scan instead of four COUNTs and a SUM
+    by_status = {
+        status: (count, amount)
+        for status, count, amount in db.session.query(
+            Order.status, db.func.count(Order.id), db.func.sum(Order.total_amount)
+        ).group_by(Order.status)
+    }
+    total_orders = sum(count for count, _ in by_status.values())
+    pending_orders = by_status.get('pending', (0, None))[0]
+    processing_orders = by_status.get('processing', (0, None))[0]
+    shipped_orders = by_status.get('shipped', (0, None))[0]
+    
+    # Recent orders: only the summary columns, and no items query
+    recent_orders = Order.query.options(
+        load_only(Order.id, Order.order_number, Order.customer_name,
+                  Order.total_amount, Order.status, Order.created_at),
+        lazyload(Order.items)
+    ).order_by(Order.created_at.desc()).limit(10).all()
+    
+    # Revenue calculation (confirmed and later orders)
+    total_revenue = float(sum(
+        amount for status, (_, amount) in by_status.items()
+        if status in REVENUE_STATUSES and amount
+    ))
+    
+    return {
+        'stats': {
+            'total_orders': total_orders,
+            'pending_orders': pending_orders,
+            'processing_orders': processing_orders,
+            'shipped_orders': shipped_orders,
+            'total_revenue': total_revenue
+        },
+        'recent_orders': [order.to_summary_dict() for order in recent_orders]
+    }
+
 @order_bp.route('/stats', methods=['GET'])
 def get_order_stats():
     """Get order statistics (admin endpoint)"""
     try:
-        total_orders = Order.query.count()
-        pending_orders = Order.query.filter_by(status='pending').count()
-        processing_orders = Order.query.filter_by(status='processing').count()
-        shipped_orders = Order.query.filter_by(status='shipped').count()
-        
-        # Recent orders
-        recent_orders = Order.query.order_by(Order.created_at.desc()).limit(10).all()
-        
-        # Revenue calculation (confirmed and processing orders)
-        revenue_query = db.session.query(db.func.sum(Order.total_amount)).filter(
-            Order.status.in_(['confirmed', 'processing', 'shipped', 'delivered'])
-        ).scalar()
-        total_revenue = float(revenue_query) if revenue_query else 0
-        
-        return jsonify({
-            'stats': {
-                'total_orders': total_orders,
-                'pending_orders': pending_orders,
-                'processing_orders': processing_orders,
-                'shipped_orders': shipped_orders,
-                'total_revenue': total_revenue
-            },
-            'recent_orders': [{
-                'id': order.id,
-                'order_number': order.order_number,
-                'customer_name': order.customer_name,
-                'total_amount': float(order.total_amount),
-                'status': order.status,
-                'created_at': order.created_at.isoformat() if order.created_at else None
-            } for order in recent_orders]
-        })
+        body = response_cache.get_or_build(
+            'orders', 'stats', ORDER_STATS_CACHE_TTL,
+            lambda: jsonify(_order_stats()).get_data()
+        )
+        return current_app.response_class(body, mimetype='application/json')
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -279,6 +422,7 @@ def confirm_payment(order_number):
         order.updated_at = datetime.utcnow()
         
         db.session.commit()
+        response_cache.bump('orders')
         
         return jsonify({
             'message': 'Payment confirmed successfully',
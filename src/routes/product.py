@@ -1,105 +1,214 @@
-from flask import Blueprint, request, jsonify
-from sqlalchemy import or_, and_
-from src.models.product import db, Product, ProductDetail, ProductImage, Inventory, Category, Fitment, Alias
+import functools
+import time
+from dataclasses import asdict, dataclass
+from flask import Blueprint, current_app, request, jsonify
+from sqlalchemy import or_, and_, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import joinedload, selectinload
+from src.models.product import db, Product, ProductDetail, ProductImage, Inventory, Category, Alias
+from src.services import redis_client, response_cache
 
 product_bp = Blueprint('product', __name__)
 
+@product_bp.record_once
+def _bootstrap_schema(state):
+    # One-time upper-casing of SKUs written before they were normalized on write;
+    # afterwards the WHERE matches nothing. Best effort: a case-only duplicate SKU
+    # makes it fail and is logged for manual cleanup.
+    with state.app.app_context():
+        try:
+            conn = db.session.connection()
+            if conn.dialect.has_table(conn, Product.__tablename__):
+                conn.execute(text("UPDATE products SET sku = UPPER(sku) WHERE sku <> UPPER(sku)"))
+                db.session.commit()
+        except SQLAlchemyError:
+            db.session.rollback()
+            state.app.logger.exception('SKU normalization failed')
+        finally:
+            db.session.remove()
+
+MAX_PER_PAGE = 100
+PRODUCTS_CACHE_TTL = 60
+
+def _int_arg(args, name, default):
+    try:
+        return int(args.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+@dataclass(slots=True)
+class ProductQuery:
+    """Parsed and bounded query-string parameters for product listing"""
+    search: str = ''
+    category: str = ''
+    page: int = 1
+    per_page: int = 20
+    cursor: int | None = None  # keyset mode: last product ID seen (0 for the first page)
+    include_total: bool = False  # offset mode: also run the COUNT(*) for total/pages
+    search_term: str | None = None
+    sku_term: str | None = None
+
+    def __post_init__(self):
+        self.page = max(self.page, 1)
+        self.per_page = min(max(self.per_page, 1), MAX_PER_PAGE)
+        self.search_term = f"%{self.search}%" if self.search else None
+        # SKUs are stored upper-case, so the SKU clause needs no case folding
+        self.sku_term = self.search_term.upper() if self.search_term else None
+
+    @classmethod
+    def from_args(cls, args):
+        return cls(
+            search=args.get('search', '').strip(),
+            category=args.get('category', '').strip(),
+            page=_int_arg(args, 'page', 1),
+            per_page=_int_arg(args, 'per_page', 20),
+            cursor=_int_arg(args, 'cursor', 0) if 'cursor' in args else None,
+            include_total=bool(_int_arg(args, 'include_total', 0))
+        )
+
+# Categories change only when the catalog is reseeded; read them at most once per
+# bucket instead of on every listing and categories request
+CATEGORY_CACHE_TTL = 300
+
+@functools.lru_cache(maxsize=1)
+def _load_categories(bucket):
+    categories = [{
+        'id': category.id,
+        'name': category.name,
+        'slug': category.slug,
+        'parent_id': category.parent_id
+    } for category in Category.query.order_by(Category.sort_order, Category.name)]
+    return categories, {category['slug']: category['id'] for category in categories}
+
+def _category_index():
+    """(categories in display order, {slug: id}), refreshed every CATEGORY_CACHE_TTL"""
+    return _load_categories(int(time.monotonic() // CATEGORY_CACHE_TTL))
+
+def _image_rank(image):
+    # Primary image first, then the lowest sort_order
+    return (not image.is_primary, image.sort_order or 0)
+
+def _listing_dict(product):
+    """Product with the extra fields the listing shows"""
+    product_data = product.to_dict()
+    
+    # Add category name
+    if product.category:
+        product_data['category'] = product.category.name
+    
+    # Add primary image, falling back to the first image
+    if product.images:
+        product_data['image'] = min(product.images, key=_image_rank).url
+    else:
+        product_data['image'] = '/api/placeholder/300/200'
+    
+    # Add inventory info
+    if product.inventory:
+        product_data['in_stock'] = product.inventory.on_hand > 0
+        product_data['quantity'] = product.inventory.on_hand
+    else:
+        product_data['in_stock'] = False
+        product_data['quantity'] = 0
+    
+    # Add basic specs for listing
+    if product.details and product.details.specs:
+        product_data['compatibility'] = product.details.specs.get('compatibility', '')
+    
+    # Add rating (mock for now)
+    product_data['rating'] = 4.5
+    product_data['reviews'] = 15
+    
+    return product_data
+
+def _product_listing(params):
+    """Listing payload for parsed ProductQuery parameters"""
+    # Base query; everything the listing serializes is loaded with the page instead
+    # of per product: to-one relations as JOINs, images in one extra IN query
+    query = Product.query.options(
+        joinedload(Product.category),
+        joinedload(Product.inventory),
+        joinedload(Product.details),
+        selectinload(Product.images)
+    ).filter(Product.status == 'active')
+    
+    # Search functionality
+    if params.search_term:
+        search_term = params.search_term
+        # Search in product fields and aliases; a correlated EXISTS stops at the first
+        # matching alias per product instead of materializing every matching ID
+        alias_match = db.session.query(Alias.id).filter(
+            Alias.product_id == Product.id,
+            Alias.value.ilike(search_term)
+        ).exists()
+        
+        query = query.filter(
+            or_(
+                Product.title.ilike(search_term),
+                Product.sku.like(params.sku_term),
+                Product.model.ilike(search_term),
+                Product.brand.ilike(search_term),
+                alias_match
+            )
+        )
+    
+    # Category filtering
+    if params.category:
+        category_id = _category_index()[1].get(params.category)
+        if category_id:
+            query = query.filter(Product.category_id == category_id)
+    
+    # ?cursor= switches to keyset paging: WHERE id > cursor rides the primary key,
+    # so deep pages cost the same as the first and no COUNT(*) is run
+    if params.cursor is not None:
+        rows = query.filter(Product.id > params.cursor).order_by(Product.id).limit(
+            params.per_page + 1
+        ).all()
+        page_items = rows[:params.per_page]
+        has_next = len(rows) > params.per_page
+        return {
+            'products': [_listing_dict(product) for product in page_items],
+            'pagination': {
+                'per_page': params.per_page,
+                'has_next': has_next,
+                'next_cursor': page_items[-1].id if has_next else None
+            }
+        }
+    
+    # Offset paging with a one-row peek for has_next; the COUNT(*) behind
+    # total/pages only runs when the client asks for it
+    rows = query.order_by(Product.id).offset((params.page - 1) * params.per_page).limit(
+        params.per_page + 1
+    ).all()
+    pagination = {
+        'page': params.page,
+        'per_page': params.per_page,
+        'has_next': len(rows) > params.per_page,
+        'has_prev': params.page > 1
+    }
+    if params.include_total:
+        total = query.order_by(None).count()
+        pagination['total'] = total
+        pagination['pages'] = -(-total // params.per_page)
+    
+    return {
+        'products': [_listing_dict(product) for product in rows[:params.per_page]],
+        'pagination': pagination
+    }
+
 @product_bp.route('/products', methods=['GET'])
 def get_products():
     """Get products with optional search and filtering"""
     try:
         # Get query parameters
-        search = request.args.get('search', '').strip()
-        category = request.args.get('category', '').strip()
-        page = int(request.args.get('page', 1))
-        per_page = min(int(request.args.get('per_page', 20)), 100)  # Max 100 per page
-        
-        # Base query
-        query = Product.query.filter(Product.status == 'active')
-        
-        # Search functionality
-        if search:
-            search_term = f"%{search}%"
-            # Search in product fields and aliases
-            alias_subquery = db.session.query(Alias.product_id).filter(
-                Alias.value.ilike(search_term)
-            ).subquery()
-            
-            query = query.filter(
-                or_(
-                    Product.title.ilike(search_term),
-                    Product.sku.ilike(search_term),
-                    Product.model.ilike(search_term),
-                    Product.brand.ilike(search_term),
-                    Product.id.in_(alias_subquery)
-                )
-            )
+        params = ProductQuery.from_args(request.args)
         
-        # Category filtering
-        if category:
-            category_obj = Category.query.filter(Category.slug == category).first()
-            if category_obj:
-                query = query.filter(Product.category_id == category_obj.id)
-        
-        # Execute query with pagination
-        products = query.paginate(
-            page=page, 
-            per_page=per_page, 
-            error_out=False
+        # Identical listings are served from the shared cache until the TTL runs out
+        # or a write bumps the namespace (a plain query when Redis isn't configured)
+        body = response_cache.get_or_build(
+            'products', redis_client.make_key(**asdict(params)), PRODUCTS_CACHE_TTL,
+            lambda: jsonify(_product_listing(params)).get_data()
         )
-        
-        # Build response with product details
-        result = []
-        for product in products.items:
-            product_data = product.to_dict()
-            
-            # Add category name
-            if product.category:
-                product_data['category'] = product.category.name
-            
-            # Add primary image
-            primary_image = ProductImage.query.filter(
-                ProductImage.product_id == product.id,
-                ProductImage.is_primary == True
-            ).first()
-            if primary_image:
-                product_data['image'] = primary_image.url
-            else:
-                # Fallback to first image
-                first_image = ProductImage.query.filter(
-                    ProductImage.product_id == product.id
-                ).order_by(ProductImage.sort_order).first()
-                product_data['image'] = first_image.url if first_image else '/api/placeholder/300/200'
-            
-            # Add inventory info
-            if product.inventory:
-                product_data['in_stock'] = product.inventory.on_hand > 0
-                product_data['quantity'] = product.inventory.on_hand
-            else:
-                product_data['in_stock'] = False
-                product_data['quantity'] = 0
-            
-            # Add basic specs for listing
-            if product.details and product.details.specs:
-                product_data['compatibility'] = product.details.specs.get('compatibility', '')
-            
-            # Add rating (mock for now)
-            product_data['rating'] = 4.5
-            product_data['reviews'] = 15
-            
-            result.append(product_data)
-        
-        return jsonify({
-            'products': result,
-            'pagination': {
-                'page': products.page,
-                'pages': products.pages,
-                'per_page': products.per_page,
-                'total': products.total,
-                'has_next': products.has_next,
-                'has_prev': products.has_prev
-            }
-        })
+        return current_app.response_class(body, mimetype='application/json')
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -108,7 +217,16 @@ def get_products():
 def get_product_detail(product_id):
     """Get detailed product information"""
     try:
-        product = Product.query.get_or_404(product_id)
+        # To-one relations join onto the product row; collections come in one
+        # IN query each rather than multiplying the joined rows
+        product = Product.query.options(
+            joinedload(Product.category),
+            joinedload(Product.details),
+            joinedload(Product.inventory),
+            selectinload(Product.images),
+            selectinload(Product.fitment),
+            selectinload(Product.aliases)
+        ).get_or_404(product_id)
         
         # Build detailed product response
         product_data = product.to_dict()
@@ -125,9 +243,7 @@ def get_product_detail(product_id):
             product_data['install_notes'] = product.details.install_notes
         
         # Add images
-        images = ProductImage.query.filter(
-            ProductImage.product_id == product.id
-        ).order_by(ProductImage.sort_order).all()
+        images = sorted(product.images, key=lambda image: image.sort_order or 0)
         product_data['images'] = [img.url for img in images]
         if not product_data['images']:
             product_data['images'] = ['/api/placeholder/600/400'] * 3
@@ -143,9 +259,8 @@ def get_product_detail(product_id):
             product_data['backorderable'] = False
         
         # Add fitment information
-        fitment = Fitment.query.filter(Fitment.product_id == product.id).all()
         product_data['fitment'] = []
-        for fit in fitment:
+        for fit in product.fitment:
             product_data['fitment'].append({
                 'year_from': fit.year_from,
                 'year_to': fit.year_to,
@@ -157,9 +272,8 @@ def get_product_detail(product_id):
             })
         
         # Add aliases
-        aliases = Alias.query.filter(Alias.product_id == product.id).all()
         product_data['aliases'] = []
-        for alias in aliases:
+        for alias in product.aliases:
             product_data['aliases'].append({
                 'type': alias.alias_type,
                 'value': alias.value
@@ -192,24 +306,20 @@ def get_related_products(product_id):
             )
         ).limit(3).all()
         
+        # Primary images for all related products in one query
+        primary_images = dict(db.session.query(ProductImage.product_id, ProductImage.url).filter(
+            ProductImage.product_id.in_([rel_product.id for rel_product in related]),
+            ProductImage.is_primary == True
+        ).all()) if related else {}
+        
         result = []
         for rel_product in related:
-            product_data = {
+            result.append({
                 'id': rel_product.id,
                 'title': rel_product.title,
                 'price': float(rel_product.price),
-                'image': '/api/placeholder/200/150'
-            }
-            
-            # Add primary image if available
-            primary_image = ProductImage.query.filter(
-                ProductImage.product_id == rel_product.id,
-                ProductImage.is_primary == True
-            ).first()
-            if primary_image:
-                product_data['image'] = primary_image.url
-            
-            result.append(product_data)
+                'image': primary_images.get(rel_product.id, '/api/placeholder/200/150')
+            })
         
         return jsonify({'related_products': result})
         
@@ -220,18 +330,7 @@ def get_related_products(product_id):
 def get_categories():
     """Get all product categories"""
     try:
-        categories = Category.query.order_by(Category.sort_order, Category.name).all()
-        
-        result = []
-        for category in categories:
-            result.append({
-                'id': category.id,
-                'name': category.name,
-                'slug': category.slug,
-                'parent_id': category.parent_id
-            })
-        
-        return jsonify({'categories': result})
+        return jsonify({'categories': _category_index()[0]})
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
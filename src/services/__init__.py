@@ -0,0 +1 @@
+# makes 'services' a package
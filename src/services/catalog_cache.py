@@ -0,0 +1,48 @@
+"""Public catalog body cache shared across workers, with write-through invalidation.
+
+Stored in the shared Redis (see ``redis_client``). Writers bump a version counter
+after committing; readers key the body by the version they see, so a write in any
+worker retires every worker's copy on its next request. When Redis is off or
+unreachable, ``version()`` is None and callers rely on their own in-process cache.
+"""
+import os
+from typing import Optional, Tuple
+
+from src.services import redis_client
+
+CATALOG_CACHE_TTL = int(os.getenv("CATALOG_CACHE_TTL", "300"))
+VERSION_KEY = "catalog:version"
+BODY_KEY_PREFIX = "catalog:public:"
+
+def version() -> Optional[int]:
+    if not redis_client.ENABLED:
+        return None
+    try:
+        raw = redis_client.client().get(VERSION_KEY)
+    except Exception:
+        return None
+    return int(raw) if raw else 0
+
+def bump() -> None:
+    if not redis_client.ENABLED:
+        return
+    try:
+        redis_client.client().incr(VERSION_KEY)
+    except Exception:
+        pass
+
+def get(version: int) -> Optional[Tuple[str, bytes]]:
+    try:
+        raw = redis_client.client().get(f"{BODY_KEY_PREFIX}{version}")
+    except Exception:
+        return None
+    if not raw:
+        return None
+    etag, _, body = raw.partition(b"\n")
+    return etag.decode(), body
+
+def put(version: int, etag: str, body: bytes) -> None:
+    try:
+        redis_client.client().set(f"{BODY_KEY_PREFIX}{version}", etag.encode() + b"\n" + body, ex=CATALOG_CACHE_TTL)
+    except Exception:
+        pass
@@ -0,0 +1,34 @@
+"""Content-addressed cache for AI product descriptions shared across workers.
+
+Stored in the shared Redis (see ``redis_client``); when it is off, every lookup
+misses and callers fall back to their in-process cache.
+"""
+import os
+from typing import Any, Dict, Optional
+
+import orjson
+
+from src.services import redis_client
+
+DESC_CACHE_TTL = int(os.getenv("DESC_CACHE_TTL", str(7 * 24 * 3600)))
+KEY_PREFIX = "desc:"
+
+def make_key(**fields: Any) -> str:
+    return KEY_PREFIX + redis_client.make_key(**fields)
+
+def get(key: str) -> Optional[Dict[str, Any]]:
+    if not redis_client.ENABLED:
+        return None
+    try:
+        raw = redis_client.client().get(key)
+    except Exception:
+        return None
+    return orjson.loads(raw) if raw else None
+
+def put(key: str, value: Dict[str, Any]) -> None:
+    if not redis_client.ENABLED:
+        return
+    try:
+        redis_client.client().set(key, orjson.dumps(value), ex=DESC_CACHE_TTL)
+    except Exception:
+        pass
@@ -0,0 +1,45 @@
+"""Thin wrapper over OpenAI's Batch API for non-interactive chat completions.
+
+Batches are billed at half the realtime rate and run outside the per-minute rate
+limits, so catalog imports go through here while single edits stay realtime.
+"""
+import io
+import json
+from typing import Any, Dict, Optional, Tuple
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+
+def submit_batch(client, bodies: Dict[str, Dict[str, Any]]) -> str:
+    """Upload one JSONL line per ``custom_id -> request body`` and start the batch."""
+    lines = (
+        json.dumps({"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body})
+        for custom_id, body in bodies.items()
+    )
+    payload = io.BytesIO("\n".join(lines).encode("utf-8"))
+    input_file = client.files.create(file=("batch.jsonl", payload), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window=COMPLETION_WINDOW,
+    )
+    return batch.id
+
+def fetch_results(client, batch_id: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """Return ``(status, results)``; results map custom_id -> message content once completed."""
+    batch = client.batches.retrieve(batch_id)
+    if batch.status != "completed" or not batch.output_file_id:
+        return batch.status, None
+
+    results: Dict[str, Any] = {}
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        row = json.loads(line)
+        response = row.get("response") or {}
+        if response.get("status_code") != 200:
+            continue
+        choices = response.get("body", {}).get("choices") or []
+        if choices:
+            results[row["custom_id"]] = choices[0]["message"].get("content")
+    return batch.status, results
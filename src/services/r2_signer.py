@@ -0,0 +1,88 @@
+"""SigV4 query-string presigning for R2 (S3 API) without botocore's request pipeline.
+
+The derived signing key only changes with the UTC date, so it is computed once a
+day and each URL costs two SHA-256 hashes plus one HMAC.
+"""
+import hashlib
+import hmac
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+ALGORITHM = "AWS4-HMAC-SHA256"
+SERVICE = "s3"
+
+def _encode(value: Any) -> str:
+    return quote(str(value), safe="-_.~")
+
+def _hmac(key: bytes, msg: str) -> bytes:
+    return hmac.new(key, msg.encode("utf-8"), hashlib.sha256).digest()
+
+class R2Signer:
+    def __init__(self, access_key: str, secret_key: str, region: str, endpoint: str, bucket: str):
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self.endpoint = endpoint.rstrip("/")
+        self.host = urlsplit(self.endpoint).netloc
+        self.bucket = bucket
+        self._key_lock = threading.Lock()
+        self._signing_key: Tuple[str, bytes] = ("", b"")
+
+    def _key_for(self, datestamp: str) -> bytes:
+        cached_date, cached_key = self._signing_key
+        if cached_date == datestamp:
+            return cached_key
+        with self._key_lock:
+            if self._signing_key[0] != datestamp:
+                k = _hmac(("AWS4" + self.secret_key).encode("utf-8"), datestamp)
+                k = _hmac(k, self.region)
+                k = _hmac(k, SERVICE)
+                self._signing_key = (datestamp, _hmac(k, "aws4_request"))
+            return self._signing_key[1]
+
+    def presign_put(self, key: str, content_type: Optional[str] = None,
+                    query: Optional[Dict[str, Any]] = None, expires: int = 3600) -> str:
+        """Path-style presigned PUT URL; extra ``query`` params (e.g. multipart part) are signed too."""
+        now = datetime.now(timezone.utc)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        datestamp = amz_date[:8]
+        scope = f"{datestamp}/{self.region}/{SERVICE}/aws4_request"
+
+        if content_type:
+            signed_headers = "content-type;host"
+            canonical_headers = f"content-type:{content_type.strip()}\nhost:{self.host}\n"
+        else:
+            signed_headers = "host"
+            canonical_headers = f"host:{self.host}\n"
+
+        params = [(str(k), str(v)) for k, v in (query or {}).items()]
+        params += [
+            ("X-Amz-Algorithm", ALGORITHM),
+            ("X-Amz-Credential", f"{self.access_key}/{scope}"),
+            ("X-Amz-Date", amz_date),
+            ("X-Amz-Expires", str(expires)),
+            ("X-Amz-SignedHeaders", signed_headers),
+        ]
+        encoded = [(_encode(k), _encode(v)) for k, v in params]
+        path = f"/{self.bucket}/{quote(key, safe='/~')}"
+
+        canonical_request = "\n".join((
+            "PUT",
+            path,
+            "&".join(f"{k}={v}" for k, v in sorted(encoded)),
+            canonical_headers,
+            signed_headers,
+            "UNSIGNED-PAYLOAD",
+        ))
+        string_to_sign = "\n".join((
+            ALGORITHM,
+            amz_date,
+            scope,
+            hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+        ))
+        signature = hmac.new(self._key_for(datestamp), string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+
+        query_string = "&".join(f"{k}={v}" for k, v in encoded)
+        return f"{self.endpoint}{path}?{query_string}&X-Amz-Signature={signature}"
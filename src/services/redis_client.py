@@ -0,0 +1,27 @@
+"""Shared Redis connection for the optional cross-worker caches.
+
+Enabled when ``REDIS_URL`` is set and the client is installed. The caches built on it
+are optimizations only: when Redis is off or unreachable, lookups miss and writes are
+skipped, and callers fall back to the database or their in-process copy.
+"""
+import functools
+import hashlib
+import importlib.util
+import os
+from typing import Any
+
+import orjson
+
+REDIS_URL = os.getenv("REDIS_URL")
+
+ENABLED = bool(REDIS_URL) and importlib.util.find_spec("redis") is not None
+
+@functools.lru_cache(maxsize=1)
+def client():
+    import redis
+    return redis.Redis.from_url(REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+def make_key(**fields: Any) -> str:
+    """Stable digest of a normalized request (sorted JSON, BLAKE2b)."""
+    payload = orjson.dumps(fields, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(payload, digest_size=20).hexdigest()
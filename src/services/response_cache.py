@@ -0,0 +1,44 @@
+"""Short-lived JSON response cache for read-mostly storefront and admin endpoints.
+
+Stored in the shared Redis (see ``redis_client``); when it is off, every lookup
+misses and the endpoint queries the database as usual. Entries live in a namespace
+with a version counter: writers call ``bump(namespace)`` after they commit, which
+retires every cached response in it at once without enumerating keys.
+"""
+from typing import Callable
+
+from src.services import redis_client
+
+KEY_PREFIX = "resp:"
+
+def get_or_build(namespace: str, key: str, ttl: int, build: Callable[[], bytes]) -> bytes:
+    """Cached body for ``key``, or ``build()`` stored under the version read beforehand.
+
+    Reading the version first means a write that lands mid-build retires the body
+    instead of leaving a stale one under the new version.
+    """
+    if not redis_client.ENABLED:
+        return build()
+    try:
+        r = redis_client.client()
+        version = (r.get(f"{KEY_PREFIX}{namespace}:version") or b"0").decode()
+        full_key = f"{KEY_PREFIX}{namespace}:{version}:{key}"
+        body = r.get(full_key)
+    except Exception:
+        return build()
+    if body is None:
+        body = build()
+        try:
+            r.set(full_key, body, ex=ttl)
+        except Exception:
+            pass
+    return body
+
+def bump(*namespaces: str) -> None:
+    if not redis_client.ENABLED:
+        return
+    try:
+        for namespace in namespaces:
+            redis_client.client().incr(f"{KEY_PREFIX}{namespace}:version")
+    except Exception:
+        pass
@@ -0,0 +1,80 @@
+import unittest
+from unittest import mock
+
+from flask import Flask
+
+from src.models.order import CartItem
+from src.models.product import Product
+from src.models.user import db
+from src.routes import cart as cart_routes
+
+
+class AddToCartTest(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.secret_key = 'test'
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        db.init_app(self.app)
+        self.app.register_blueprint(cart_routes.cart_bp)
+        with self.app.app_context():
+            db.create_all()
+            product = Product(sku='MET-1', title='Turbo', brand='Metier', price=100)
+            db.session.add(product)
+            db.session.commit()
+            self.product_id = product.id
+
+        # The stock check reads these; stock itself isn't under test here
+        for name, value in (('in_stock', True), ('quantity', 10), ('image', None)):
+            patcher = mock.patch.object(Product, name, value, create=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.client = self.app.test_client()
+
+    def add(self, quantity):
+        return self.client.post('/api/cart/add', json={'product_id': self.product_id, 'quantity': quantity})
+
+    def cart_lines(self):
+        with self.app.app_context():
+            return db.session.query(CartItem.product_id, CartItem.quantity).all()
+
+    def test_repeat_add_sums_into_one_line(self):
+        self.assertEqual(self.add(2).status_code, 200)
+        self.assertEqual(self.add(3).status_code, 200)
+        self.assertEqual(self.cart_lines(), [(self.product_id, 5)])
+
+    def existing_line(self, quantity):
+        # A line another request inserted after our UPDATE found nothing to bump
+        self.client.get('/api/cart')
+        with self.client.session_transaction() as session:
+            cart_id = session['cart_id']
+        with self.app.app_context():
+            db.session.add(CartItem(cart_id=cart_id, product_id=self.product_id, quantity=quantity, price=100))
+            db.session.commit()
+
+    def add_after_losing_race(self, quantity):
+        # The first bump misses (the line wasn't there yet); later ones run for real
+        bump, calls = cart_routes._bump_cart_line, []
+
+        def bump_after_race(*args):
+            calls.append(args)
+            return None if len(calls) == 1 else bump(*args)
+
+        with mock.patch.object(cart_routes, '_bump_cart_line', side_effect=bump_after_race):
+            response = self.add(quantity)
+        self.assertEqual(len(calls), 2)
+        return response
+
+    def test_first_add_racing_an_existing_line_sums_into_it(self):
+        self.existing_line(2)
+        self.assertEqual(self.add_after_losing_race(3).status_code, 200)
+        self.assertEqual(self.cart_lines(), [(self.product_id, 5)])
+
+    def test_first_add_racing_an_existing_line_checks_stock(self):
+        self.existing_line(8)
+        self.assertEqual(self.add_after_losing_race(3).status_code, 400)
+        self.assertEqual(self.cart_lines(), [(self.product_id, 8)])
+
+
+if __name__ == '__main__':
+    unittest.main()